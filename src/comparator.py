@@ -1,8 +1,10 @@
 """Key comparison engine for KeySync Mini."""
 
 import logging
-from typing import Dict, List, Set, Tuple, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import sys
+from typing import Dict, List, Set, Tuple, Any, Optional, Union
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from threading import Lock
 from pathlib import Path
 import csv
@@ -10,20 +12,76 @@ import csv
 import pandas as pd
 
 from normalizer import Normalizer
+from normalizer_worker import init_worker, get_worker_normalizer
 
 logger = logging.getLogger(__name__)
 
+# A normalized_map entry holds a bare str while a normalized key has a single
+# source key (the common case) and is only promoted to a set on collision.
+NormalizedEntry = Union[str, Set[str]]
+
+
+def iter_original_keys(entry: NormalizedEntry) -> Tuple[str, ...]:
+    """Return the original key(s) stored in a normalized_map entry."""
+    if isinstance(entry, str):
+        return (entry,)
+    return tuple(entry)
+
+
+def record_row(columns: Dict[str, List[str]], index: int) -> Dict[str, str]:
+    """Materialize one row as a dict from columnar record storage."""
+    return {name: values[index] for name, values in columns.items()}
+
+
+def _load_and_normalize_worker(
+    system_name: str,
+    file_path: str,
+    batch_size: int,
+    keep_records: bool
+) -> Tuple[Dict[str, NormalizedEntry], Dict[str, List[str]], Dict[str, Any], Dict[str, Any]]:
+    """Load and normalize one system in a worker process.
+
+    Module-level so it is picklable; uses the process-wide Normalizer set up
+    by the pool initializer and returns both the worker's comparator stats
+    and its Normalizer stats for merging in the parent. The process-wide
+    Normalizer's stats are reset at task start so pool reuse across systems
+    reports each task's delta exactly once.
+    """
+    normalizer = get_worker_normalizer()
+    normalizer.reset_statistics()
+    worker = Comparator(
+        normalizer, parallel=False, batch_size=batch_size,
+        keep_records=keep_records
+    )
+    normalized_map, records = worker.load_and_normalize_system(system_name, file_path)
+    return normalized_map, records, worker.stats, normalizer.stats
+
 
 class Comparator:
     """Compare keys across multiple systems after normalization."""
 
-    def __init__(self, normalizer: Normalizer, parallel: bool = True, batch_size: int = 1000):
-        """Initialize comparator with normalizer."""
+    __slots__ = ('normalizer', 'parallel', 'batch_size', 'max_workers',
+                 'keep_records', 'stats_lock', 'stats', '_norm_cache')
+
+    # Cap on cached raw->normalized entries to bound memory on huge inputs
+    NORM_CACHE_MAX_SIZE = 200_000
+
+    def __init__(self, normalizer: Normalizer, parallel: bool = True, batch_size: int = 1000,
+                 max_workers: int = 5, keep_records: bool = False):
+        """Initialize comparator with normalizer.
+
+        Records (full per-row metadata) are discarded by default since no
+        comparison stage reads them; pass keep_records=True when a caller
+        needs them.
+        """
         self.normalizer = normalizer
         self.parallel = parallel
         self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.keep_records = keep_records
         self.stats_lock = Lock()
         self.stats = self._reset_stats()
+        self._norm_cache: Dict[str, str] = {}
 
     def _reset_stats(self) -> Dict[str, Any]:
         """Reset comparison statistics."""
@@ -34,10 +92,15 @@ class Comparator:
             'processing_errors': []
         }
 
-    def load_system_data(self, file_path: str) -> Tuple[List[str], List[Dict[str, str]]]:
-        """Load keys from a CSV file."""
+    def load_system_data(self, file_path: str) -> Tuple[List[str], Dict[str, List[str]]]:
+        """Load keys from a CSV file.
+
+        Records are stored column-oriented (column name -> list of values)
+        to avoid a per-row dict allocation; use record_row() for the rare
+        per-row consumer.
+        """
         keys = []
-        records = []
+        records: Dict[str, List[str]] = {}
 
         try:
             path = Path(file_path)
@@ -46,11 +109,29 @@ class Comparator:
                 return keys, records
 
             with open(path, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if 'key' in row and row['key']:
-                        keys.append(row['key'])
-                        records.append(row)
+                # csv.reader with a fixed column index avoids the per-row
+                # dict that DictReader builds just to pull one column.
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header is None:
+                    logger.warning(f"Empty file: {file_path}")
+                    return keys, records
+                if 'key' not in header:
+                    logger.warning(f"No 'key' column in {file_path}")
+                    return keys, records
+                key_idx = header.index('key')
+                if self.keep_records:
+                    columns = [[] for _ in header]
+                    for row in reader:
+                        if key_idx < len(row) and row[key_idx]:
+                            keys.append(row[key_idx])
+                            for i in range(len(header)):
+                                columns[i].append(row[i] if i < len(row) else '')
+                    records = dict(zip(header, columns))
+                else:
+                    for row in reader:
+                        if key_idx < len(row) and row[key_idx]:
+                            keys.append(row[key_idx])
 
             logger.info(f"Loaded {len(keys)} keys from {file_path}")
 
@@ -63,21 +144,47 @@ class Comparator:
 
         return keys, records
 
-    def normalize_system_keys(self, system_name: str, keys: List[str]) -> Dict[str, Set[str]]:
-        """Normalize keys from a system and track duplicates."""
-        normalized_map = {}  # normalized -> set of original keys
+    def normalize_system_keys(self, system_name: str, keys: List[str]) -> Dict[str, NormalizedEntry]:
+        """Normalize keys from a system and track duplicates.
+
+        Values start as a bare original-key string and are promoted to a set
+        only when a second distinct original key maps to the same normalized
+        key, avoiding per-entry set overhead for the common singleton case.
+        """
+        normalized_map = {}  # normalized -> original key str, or set on collision
+
+        cache = self._norm_cache
+
+        # Normalize cache misses as one vectorized batch, then resolve every
+        # key through the cache (raw keys repeat often in real data).
+        misses = list(dict.fromkeys(key for key in keys if key not in cache))
+        if misses:
+            if len(cache) + len(misses) > self.NORM_CACHE_MAX_SIZE:
+                cache.clear()
+            # Intern so identical normalized keys arriving from different
+            # systems share one str object across the cross-system sets
+            cache.update(zip(
+                misses,
+                (sys.intern(normalized)
+                 for normalized in self.normalizer.normalize_batch(misses))
+            ))
 
         for key in keys:
-            normalized = self.normalizer.normalize(key)
-            if normalized not in normalized_map:
-                normalized_map[normalized] = set()
-            normalized_map[normalized].add(key)
+            normalized = cache[key]
+            existing = normalized_map.get(normalized)
+            if existing is None:
+                normalized_map[normalized] = key
+            elif isinstance(existing, str):
+                if existing != key:
+                    normalized_map[normalized] = {existing, key}
+            else:
+                existing.add(key)
 
         # Identify duplicates (multiple original keys mapping to same normalized key)
         duplicates = {
             norm_key: orig_keys
             for norm_key, orig_keys in normalized_map.items()
-            if len(orig_keys) > 1
+            if isinstance(orig_keys, set) and len(orig_keys) > 1
         }
 
         if duplicates:
@@ -87,7 +194,7 @@ class Comparator:
 
         return normalized_map
 
-    def process_system_batch(self, system_name: str, keys_batch: List[str]) -> Dict[str, Set[str]]:
+    def process_system_batch(self, system_name: str, keys_batch: List[str]) -> Dict[str, NormalizedEntry]:
         """Process a batch of keys for a system."""
         return self.normalize_system_keys(system_name, keys_batch)
 
@@ -108,19 +215,32 @@ class Comparator:
         # Load and normalize all systems
         system_data = {}
 
-        if self.parallel:
-            # Parallel processing
-            with ThreadPoolExecutor(max_workers=5) as executor:
+        if self.parallel and len(system_files) > 1:
+            # Normalization is CPU-bound pure Python, so use processes to
+            # escape the GIL; each worker rebuilds its own Normalizer.
+            max_workers = min(self.max_workers, len(system_files), os.cpu_count() or 1)
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=init_worker,
+                initargs=(self.normalizer._init_config,)
+            ) as executor:
                 future_to_system = {}
 
                 for system_name, file_path in system_files.items():
-                    future = executor.submit(self.load_and_normalize_system, system_name, file_path)
+                    future = executor.submit(
+                        _load_and_normalize_worker,
+                        system_name,
+                        file_path,
+                        self.batch_size,
+                        self.keep_records
+                    )
                     future_to_system[future] = system_name
 
                 for future in as_completed(future_to_system):
                     system_name = future_to_system[future]
                     try:
-                        normalized_map, records = future.result()
+                        normalized_map, records, worker_stats, normalizer_stats = future.result()
+                        self._merge_worker_stats(worker_stats, normalizer_stats)
                         system_data[system_name] = {
                             'normalized': normalized_map,
                             'records': records
@@ -143,48 +263,45 @@ class Comparator:
             logger.error("System A data not found - cannot perform comparison")
             return results
 
-        # Get all unique normalized keys
-        all_keys = set()
-        for system_name, data in system_data.items():
-            all_keys.update(data['normalized'].keys())
+        # Build each system's key view once; dict views are set-like and
+        # support the C-implemented set operations directly.
+        keyset = {name: data['normalized'].keys() for name, data in system_data.items()}
+        other_keysets = [keyset[s] for s in ['B', 'C', 'D', 'E'] if s in keyset]
 
+        # Get all unique normalized keys
+        all_keys = set().union(*keyset.values())
         results['all_keys'] = all_keys
 
         # System A keys (authoritative)
-        a_keys = set(system_data['A']['normalized'].keys())
-
-        # Keys only in A (propagation gaps)
-        keys_only_in_a = a_keys.copy()
-        for system_name in ['B', 'C', 'D', 'E']:
-            if system_name in system_data:
-                keys_only_in_a -= set(system_data[system_name]['normalized'].keys())
+        a_keys = set(keyset['A'])
+
+        # System-specific gaps (keys in A but missing from specific systems),
+        # computed first so the other A-side outputs derive from the gap sets
+        # in one fused pass instead of re-walking every system's keyset.
+        gaps = {
+            system_name: a_keys - keyset[system_name]
+            for system_name in ['B', 'C', 'D', 'E']
+            if system_name in keyset
+        }
+        results['comparison']['system_specific_gaps'] = gaps
+
+        if gaps:
+            gap_sets = list(gaps.values())
+            # Keys only in A: missing from every other system
+            keys_only_in_a = gap_sets[0].intersection(*gap_sets[1:])
+            # Keys present in all systems: in A and missing from none
+            keys_in_all = a_keys.difference(*gap_sets)
+        else:
+            keys_only_in_a = set(a_keys)
+            keys_in_all = set(a_keys)
 
         results['comparison']['keys_only_in_a'] = keys_only_in_a
+        results['comparison']['keys_in_all_systems'] = keys_in_all
 
         # Keys missing in A (out-of-authority)
-        keys_in_others = set()
-        for system_name in ['B', 'C', 'D', 'E']:
-            if system_name in system_data:
-                keys_in_others.update(system_data[system_name]['normalized'].keys())
-
-        keys_missing_in_a = keys_in_others - a_keys
+        keys_missing_in_a = set().union(*other_keysets) - a_keys
         results['comparison']['keys_missing_in_a'] = keys_missing_in_a
 
-        # Keys present in all systems
-        keys_in_all = a_keys.copy()
-        for system_name in ['B', 'C', 'D', 'E']:
-            if system_name in system_data:
-                keys_in_all &= set(system_data[system_name]['normalized'].keys())
-
-        results['comparison']['keys_in_all_systems'] = keys_in_all
-
-        # System-specific gaps (keys in A but missing from specific systems)
-        for system_name in ['B', 'C', 'D', 'E']:
-            if system_name in system_data:
-                system_keys = set(system_data[system_name]['normalized'].keys())
-                missing_from_system = a_keys - system_keys
-                results['comparison']['system_specific_gaps'][system_name] = missing_from_system
-
         # Calculate statistics
         total_unique = len(all_keys)
         results['statistics'] = {
@@ -205,7 +322,18 @@ class Comparator:
 
         return results
 
-    def load_and_normalize_system(self, system_name: str, file_path: str) -> Tuple[Dict[str, Set[str]], List[Dict]]:
+    def _merge_worker_stats(self, worker_stats: Dict[str, Any],
+                            normalizer_stats: Optional[Dict[str, Any]] = None):
+        """Merge stats returned by a worker process into this instance."""
+        with self.stats_lock:
+            self.stats['total_keys_processed'] += worker_stats.get('total_keys_processed', 0)
+            self.stats['systems_compared'].extend(worker_stats.get('systems_compared', []))
+            self.stats['duplicates_found'].update(worker_stats.get('duplicates_found', {}))
+            self.stats['processing_errors'].extend(worker_stats.get('processing_errors', []))
+            if normalizer_stats:
+                self.normalizer.merge_stats(normalizer_stats)
+
+    def load_and_normalize_system(self, system_name: str, file_path: str) -> Tuple[Dict[str, NormalizedEntry], Dict[str, List[str]]]:
         """Load and normalize keys for a system."""
         keys, records = self.load_system_data(file_path)
 
@@ -213,17 +341,28 @@ class Comparator:
             self.stats['total_keys_processed'] += len(keys)
             self.stats['systems_compared'].append(system_name)
 
+        # Single pass when everything fits in one batch; skips the merge step
+        if len(keys) <= self.batch_size:
+            return self.normalize_system_keys(system_name, keys), records
+
         # Process in batches
         normalized_map = {}
         for i in range(0, len(keys), self.batch_size):
             batch = keys[i:i + self.batch_size]
             batch_map = self.normalize_system_keys(system_name, batch)
 
-            # Merge batch results
+            # Merge batch results, preserving lazy str/set promotion
             for norm_key, orig_keys in batch_map.items():
-                if norm_key not in normalized_map:
-                    normalized_map[norm_key] = set()
-                normalized_map[norm_key].update(orig_keys)
+                existing = normalized_map.get(norm_key)
+                if existing is None:
+                    normalized_map[norm_key] = orig_keys
+                elif existing == orig_keys:
+                    continue
+                else:
+                    if isinstance(existing, str):
+                        existing = {existing}
+                        normalized_map[norm_key] = existing
+                    existing.update(iter_original_keys(orig_keys))
 
         return normalized_map, records
 
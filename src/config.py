@@ -1,17 +1,44 @@
 """Configuration management for KeySync Mini."""
 
-import copy
 import yaml
 import logging
+
+try:
+    # libyaml C bindings are 5-10x faster than the pure-Python parser
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, Optional, Union
 
 logger = logging.getLogger(__name__)
 
+# Parsed YAML keyed by (path, mtime_ns, size) so repeated Config
+# constructions in one process skip the parser for unchanged files
+_YAML_CACHE: Dict[tuple, Dict[str, Any]] = {}
+
+
+def _copy_tree(node: Any) -> Any:
+    """Copy nested dict/list config structures without copy.deepcopy overhead.
+
+    Immutable leaves (strings, numbers, booleans) are shared, only the
+    mutable containers are duplicated.
+    """
+    if isinstance(node, Mapping):
+        return {key: _copy_tree(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_copy_tree(value) for value in node]
+    return node
+
 
 class Config:
     """Configuration manager for KeySync Mini."""
 
+    __slots__ = ('config_path', 'config_file', '_config_dir', '_defaults',
+                 '_system_files_cache', 'config')
+
     def __init__(self, config_file: Optional[str] = None):
         """Initialize configuration from YAML file or defaults."""
         initial_path = Path(config_file or 'keysync-config.yaml').expanduser()
@@ -24,7 +51,8 @@ class Config:
         self.config_file = str(self.config_path)
         self._config_dir = self.config_path.parent
 
-        self._defaults = self._get_default_config()
+        self._defaults = _DEFAULT_CONFIG
+        self._system_files_cache: Optional[Dict[str, str]] = None
         self.config = self._load_config()
         self._validate_config()
 
@@ -33,12 +61,19 @@ class Config:
         config_path = self.config_path
 
         # Start with defaults so missing sections still have sensible values
-        config = copy.deepcopy(self._defaults)
+        config = _copy_tree(_DEFAULT_CONFIG)
 
         if config_path.exists():
             try:
-                with open(config_path, 'r') as f:
-                    user_config = yaml.safe_load(f) or {}
+                stat = config_path.stat()
+                cache_key = (str(config_path), stat.st_mtime_ns, stat.st_size)
+                cached = _YAML_CACHE.get(cache_key)
+                if cached is not None:
+                    user_config = _copy_tree(cached)
+                else:
+                    with open(config_path, 'r') as f:
+                        user_config = yaml.load(f, Loader=SafeLoader) or {}
+                    _YAML_CACHE[cache_key] = _copy_tree(user_config)
                 logger.info(f"Loaded configuration from {config_path}")
                 self._deep_update(config, user_config)
                 return config
@@ -51,7 +86,12 @@ class Config:
             return config
 
     def _get_default_config(self) -> Dict[str, Any]:
-        """Get default configuration."""
+        """Get a mutable copy of the default configuration."""
+        return _copy_tree(_DEFAULT_CONFIG)
+
+    @staticmethod
+    def _build_default_config() -> Dict[str, Any]:
+        """Build the default configuration tree (done once at import)."""
         return {
             'schedule': '0 2 * * *',
             'normalize': {
@@ -196,11 +236,17 @@ class Config:
     def get_section(self, section: str) -> Dict[str, Any]:
         """Get entire configuration section."""
         if section in self.config:
-            return copy.deepcopy(self.config[section])
-        return copy.deepcopy(self._defaults.get(section, {}))
+            return _copy_tree(self.config[section])
+        return _copy_tree(self._defaults.get(section, {}))
 
     def get_system_files(self) -> Dict[str, str]:
-        """Get system file paths from sources configuration."""
+        """Get system file paths from sources configuration.
+
+        Resolution stats the filesystem, so the mapping is cached until the
+        configuration is updated.
+        """
+        if self._system_files_cache is not None:
+            return dict(self._system_files_cache)
         sources = self.get_section('sources')
         resolved: Dict[str, str] = {}
         for system, source in sources.items():
@@ -211,7 +257,8 @@ class Config:
                 continue
             resolved_path = self.resolve_path(raw_path)
             resolved[system] = str(resolved_path)
-        return resolved
+        self._system_files_cache = resolved
+        return dict(resolved)
 
     @property
     def config_dir(self) -> Path:
@@ -230,6 +277,7 @@ class Config:
     def update(self, updates: Dict[str, Any]):
         """Update configuration with new values."""
         self._deep_update(self.config, updates)
+        self._system_files_cache = None
         logger.info("Configuration updated")
 
     def _deep_update(self, base: dict, updates: dict):
@@ -253,7 +301,8 @@ class Config:
         save_path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(save_path, 'w') as f:
-            yaml.dump(self.config, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(self.config, f, Dumper=SafeDumper,
+                      default_flow_style=False, sort_keys=False)
 
         logger.info(f"Configuration saved to {save_path}")
 
@@ -263,4 +312,9 @@ class Config:
 
     def __str__(self) -> str:
         """String representation of configuration."""
-        return yaml.dump(self.config, default_flow_style=False)
+        return yaml.dump(self.config, Dumper=SafeDumper, default_flow_style=False)
+
+
+# Shared immutable default tree; instances copy from this lazily instead of
+# deep-copying a fresh default dict per construction.
+_DEFAULT_CONFIG = MappingProxyType(Config._build_default_config())
@@ -2,37 +2,209 @@
 
 import sqlite3
 import logging
+import queue
+import threading
+from contextlib import contextmanager
+from functools import singledispatch
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 import json
 
+try:
+    # orjson serializes nested dicts at C speed; fall back to compact stdlib json
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'), default=str)
+
 logger = logging.getLogger(__name__)
 
 
+@singledispatch
+def _to_serializable(obj: Any) -> Any:
+    """Rebuild an object graph with sets converted to lists.
+
+    singledispatch resolves the container type through its type cache, so
+    scalar leaves skip the isinstance chain entirely.
+    """
+    return obj
+
+
+@_to_serializable.register(set)
+def _(obj: set) -> list:
+    return [_to_serializable(item) for item in obj]
+
+
+@_to_serializable.register(dict)
+def _(obj: dict) -> dict:
+    return {k: _to_serializable(v) for k, v in obj.items()}
+
+
+@_to_serializable.register(list)
+def _(obj: list) -> list:
+    return [_to_serializable(item) for item in obj]
+
+
+# Bump when the DDL below changes so existing databases re-run _init_schema
+_SCHEMA_VERSION = 3
+
+# Hot-path SQL held as module constants: sqlite3's statement cache is keyed
+# by string identity, so reusing the same object guarantees VDBE reuse
+_SQL_TRACK_KEY = """
+    INSERT INTO key_tracking (system_name, key_value, normalized_key, run_id)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(system_name, normalized_key)
+    DO UPDATE SET last_seen_at = CURRENT_TIMESTAMP, run_id = ?
+"""
+
+_SQL_TRACK_KEYS_BATCH = """
+    INSERT INTO key_tracking (system_name, key_value, normalized_key, run_id, last_seen_at)
+    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(system_name, normalized_key)
+    DO UPDATE SET last_seen_at = CURRENT_TIMESTAMP, run_id = ?
+"""
+
+# RETURNING (SQLite >= 3.35) hands back the generated id in the same
+# statement instead of a lastrowid round trip
+_SQL_PROPOSE_MASTER_KEY = """
+    INSERT INTO master_key_registry
+    (master_key, source_system, source_key, status, provisioning_strategy, run_id)
+    VALUES (?, ?, ?, 'proposed', ?, ?)
+    RETURNING master_key_id
+"""
+
+_SQL_LOG_EVENT = """
+    INSERT INTO audit_log
+    (run_id, event_type, event_details, system_name, key_value, action_taken, result)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+# One physical connection per database file *per thread*: duplicate Database
+# constructions on the same thread share state instead of re-opening the
+# .db/.db-wal/.db-shm trio, while each thread gets its own connection because
+# sqlite3 objects are bound to the thread that created them (the threaded
+# Flask dashboard runs reconciliations on a fresh thread per request).
+# Entries are evicted when the last alias closes so a later open starts fresh.
+_OPEN_DBS = threading.local()
+
+
+def _open_dbs() -> Dict[str, "Database"]:
+    """Return the calling thread's open-database registry."""
+    try:
+        return _OPEN_DBS.registry
+    except AttributeError:
+        registry = _OPEN_DBS.registry = {}
+        return registry
+
+
 class Database:
     """SQLite database manager for state persistence."""
 
+    # Max concurrent read-only connections; WAL lets them run alongside writes
+    READ_POOL_SIZE = 4
+
     def __init__(self, db_path: str = "data/keysync.db"):
         """Initialize database connection and schema."""
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._is_memory = db_path == ':memory:'
+        self._registry_key: Optional[str] = None
+        if not self._is_memory:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            registry = _open_dbs()
+            registry_key = str(self.db_path.resolve())
+            existing = registry.get(registry_key)
+            if existing is not None:
+                # Alias this instance onto the already-open database
+                existing._alias_count += 1
+                self.__dict__ = existing.__dict__
+                return
+            self._registry_key = registry_key
+            registry[registry_key] = self
+        # Aliases share this instance's __dict__, so the count tracks how
+        # many close() calls remain before the connections really close
+        self._alias_count = 1
+        self._read_conns: queue.Queue = queue.Queue()
+        self._read_conns_created = 0
+        self._read_pool_lock = threading.Lock()
         self.conn: Optional[sqlite3.Connection] = None
+        # Last serialized config snapshot (config dict, JSON text); repeated
+        # runs with an unchanged config skip re-serialization
+        self._config_json_cache: Optional[Tuple[Dict[str, Any], str]] = None
+        # Dedupe repeated audit detail strings (e.g. the same error text
+        # logged for many rows) so only one copy is kept alive in-process
+        self._event_details_interned: Dict[str, str] = {}
         self._connect()
         self._init_schema()
 
     def _connect(self):
         """Establish database connection."""
-        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn = sqlite3.connect(str(self.db_path), cached_statements=256)
         self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA foreign_keys = ON")
         self.conn.execute("PRAGMA journal_mode = WAL")
-        self.conn.execute("PRAGMA synchronous = NORMAL")  # Faster writes
-        self.conn.execute("PRAGMA cache_size = 10000")     # Larger cache
-        self.conn.execute("PRAGMA temp_store = MEMORY")    # Use memory for temp tables
+        self.conn.execute("PRAGMA synchronous = NORMAL")       # Faster writes
+        self.conn.execute("PRAGMA cache_size = -262144")       # 256MB page cache
+        self.conn.execute("PRAGMA temp_store = MEMORY")        # Use memory for temp tables
+        self.conn.execute("PRAGMA mmap_size = 268435456")      # Memory-map up to 256MB
+        self.conn.execute("PRAGMA busy_timeout = 30000")       # Wait instead of SQLITE_BUSY
+        self.conn.execute("PRAGMA wal_autocheckpoint = 1000")  # Bound WAL growth
+
+    def _open_read_conn(self) -> sqlite3.Connection:
+        """Open an additional read-only connection for the pool."""
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute("PRAGMA busy_timeout = 30000")
+        return conn
+
+    @property
+    def supports_concurrent_reads(self) -> bool:
+        """Whether pooled read connections can serve multiple threads.
+
+        In-memory databases are private to the single write connection, so
+        callers must stay on the creating thread for those.
+        """
+        return not self._is_memory
+
+    @contextmanager
+    def read(self):
+        """Check out a pooled read-only connection for committed-data queries.
+
+        In-memory databases are private to their connection, so those fall
+        back to the write connection.
+        """
+        if self._is_memory:
+            yield self.conn
+            return
+        try:
+            conn = self._read_conns.get_nowait()
+        except queue.Empty:
+            # The pool is shared across report threads, so guard the lazy
+            # growth decision
+            with self._read_pool_lock:
+                grow = self._read_conns_created < self.READ_POOL_SIZE
+                if grow:
+                    self._read_conns_created += 1
+            if grow:
+                conn = self._open_read_conn()
+            else:
+                conn = self._read_conns.get()
+        try:
+            yield conn
+        finally:
+            self._read_conns.put(conn)
 
     def _init_schema(self):
         """Initialize database schema."""
+        # Fast path: an up-to-date database skips all the IF NOT EXISTS DDL
+        # (and its sqlite_master scans) on startup
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] == _SCHEMA_VERSION:
+            return
         with self.conn:
             # Reconciliation runs table
             self.conn.execute("""
@@ -107,8 +279,16 @@ class Database:
             """)
 
             self.conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_key_tracking_lookup
-                ON key_tracking(system_name, normalized_key)
+                CREATE INDEX IF NOT EXISTS idx_master_key_run_status
+                ON master_key_registry(run_id, status)
+            """)
+
+            # Covering index: lookups by (system, normalized key) can serve
+            # last_seen_at/run_id straight from the index without a row fetch
+            self.conn.execute("DROP INDEX IF EXISTS idx_key_tracking_lookup")
+            self.conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_key_tracking_covering
+                ON key_tracking(system_name, normalized_key, last_seen_at, run_id)
             """)
 
             self.conn.execute("""
@@ -116,13 +296,21 @@ class Database:
                 ON audit_log(run_id, timestamp DESC)
             """)
 
+            self.conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
     def start_run(self, run_mode: str, execution_mode: str, config: Dict[str, Any]) -> int:
         """Start a new reconciliation run."""
+        cached = self._config_json_cache
+        if cached is not None and cached[0] == config:
+            config_json = cached[1]
+        else:
+            config_json = _dumps(config)
+            self._config_json_cache = (config, config_json)
         cursor = self.conn.execute("""
             INSERT INTO reconciliation_runs
             (run_mode, execution_mode, status, config_snapshot)
             VALUES (?, ?, 'running', ?)
-        """, (run_mode, execution_mode, json.dumps(config)))
+        """, (run_mode, execution_mode, config_json))
         self.conn.commit()
         return cursor.lastrowid
 
@@ -135,51 +323,92 @@ class Database:
             UPDATE reconciliation_runs
             SET status = ?, stats_json = ?, error_message = ?, completed_at = CURRENT_TIMESTAMP
             WHERE run_id = ?
-        """, (status, json.dumps(serializable_stats), error, run_id))
+        """, (status, _dumps(serializable_stats), error, run_id))
         self.conn.commit()
 
-    def _make_json_serializable(self, obj: Any) -> Any:
-        """Convert non-serializable objects (like sets) to JSON-serializable format."""
+    def _contains_set(self, obj: Any) -> bool:
+        """Check whether any set is nested in the object graph (stops at first hit)."""
         if isinstance(obj, set):
-            return list(obj)
+            return True
         elif isinstance(obj, dict):
-            return {k: self._make_json_serializable(v) for k, v in obj.items()}
+            return any(self._contains_set(v) for v in obj.values())
         elif isinstance(obj, list):
-            return [self._make_json_serializable(item) for item in obj]
-        return obj
+            return any(self._contains_set(item) for item in obj)
+        return False
+
+    def _make_json_serializable(self, obj: Any) -> Any:
+        """Convert non-serializable objects (like sets) to JSON-serializable format."""
+        # Already-serializable graphs are returned as-is instead of rebuilding
+        # every container just to produce an identical copy
+        if not self._contains_set(obj):
+            return obj
+        return _to_serializable(obj)
+
+    def save_checkpoint(self, run_id: int, checkpoint_data: Dict[str, Any],
+                        commit: bool = True):
+        """Save checkpoint data for recovery.
 
-    def save_checkpoint(self, run_id: int, checkpoint_data: Dict[str, Any]):
-        """Save checkpoint data for recovery."""
+        Callers inside a run pass commit=False so successive checkpoints
+        ride the run's batch commit instead of paying one fsync each.
+        """
         # Convert sets to lists for JSON serialization
         serializable_data = self._make_json_serializable(checkpoint_data)
         self.conn.execute("""
             UPDATE reconciliation_runs
             SET checkpoint_data = ?
             WHERE run_id = ?
-        """, (json.dumps(serializable_data), run_id))
-        self.conn.commit()
+        """, (_dumps(serializable_data), run_id))
+        if commit:
+            self.conn.commit()
 
     def get_last_successful_run(self) -> Optional[Dict[str, Any]]:
         """Get the last successful run for incremental mode."""
-        cursor = self.conn.execute("""
-            SELECT * FROM reconciliation_runs
-            WHERE status = 'completed'
-            ORDER BY run_timestamp DESC
-            LIMIT 1
-        """)
-        row = cursor.fetchone()
+        with self.read() as conn:
+            cursor = conn.execute("""
+                SELECT * FROM reconciliation_runs
+                WHERE status = 'completed'
+                ORDER BY run_timestamp DESC
+                LIMIT 1
+            """)
+            row = cursor.fetchone()
         return dict(row) if row else None
 
     def propose_master_key(self, run_id: int, master_key: str, source_system: str,
                           source_key: str, strategy: str) -> int:
         """Propose a new master key."""
-        cursor = self.conn.execute("""
-            INSERT INTO master_key_registry
-            (master_key, source_system, source_key, status, provisioning_strategy, run_id)
-            VALUES (?, ?, ?, 'proposed', ?, ?)
-        """, (master_key, source_system, source_key, strategy, run_id))
-        self.conn.commit()
-        return cursor.lastrowid
+        cursor = self.conn.execute(_SQL_PROPOSE_MASTER_KEY,
+                                   (master_key, source_system, source_key, strategy, run_id))
+        # Don't commit here - proposals are committed once per run phase
+        return cursor.fetchone()[0]
+
+    def propose_master_keys_bulk(self, run_id: int,
+                                 proposals: List[Tuple[str, str, str, str]]) -> List[int]:
+        """Propose multiple master keys, returning their generated ids.
+
+        Rows are (master_key, source_system, source_key, strategy). The
+        RETURNING statement is executed per row (executemany cannot return
+        rows) but the prepared statement is reused and nothing is committed
+        until the caller decides to.
+
+        The batch runs inside a savepoint: a failure mid-batch rolls back
+        every row inserted so far, so callers can retry row by row without
+        tripping over half-applied inserts in the open transaction.
+        """
+        execute = self.conn.execute
+        execute("SAVEPOINT propose_bulk")
+        try:
+            ids = [
+                execute(_SQL_PROPOSE_MASTER_KEY,
+                        (master_key, source_system, source_key, strategy, run_id)
+                        ).fetchone()[0]
+                for master_key, source_system, source_key, strategy in proposals
+            ]
+        except Exception:
+            execute("ROLLBACK TO propose_bulk")
+            raise
+        finally:
+            execute("RELEASE propose_bulk")
+        return ids
 
     def activate_master_keys(self, run_id: int):
         """Activate all proposed master keys from a run."""
@@ -192,46 +421,102 @@ class Database:
 
     def track_key(self, run_id: int, system_name: str, key_value: str, normalized_key: str):
         """Track a key occurrence for temporal analysis."""
-        self.conn.execute("""
-            INSERT INTO key_tracking (system_name, key_value, normalized_key, run_id)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(system_name, normalized_key)
-            DO UPDATE SET last_seen_at = CURRENT_TIMESTAMP, run_id = ?
-        """, (system_name, key_value, normalized_key, run_id, run_id))
+        self.conn.execute(_SQL_TRACK_KEY,
+                          (system_name, key_value, normalized_key, run_id, run_id))
 
     def track_keys_batch(self, run_id: int, keys_data: List[Tuple[str, str, str]]):
         """Track multiple keys in a single batch operation for better performance."""
-        self.conn.executemany("""
-            INSERT INTO key_tracking (system_name, key_value, normalized_key, run_id, last_seen_at)
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ON CONFLICT(system_name, normalized_key)
-            DO UPDATE SET last_seen_at = CURRENT_TIMESTAMP, run_id = ?
-        """, [(system, key, norm_key, run_id, run_id)
-              for system, key, norm_key in keys_data])
+        # The parent run row is guaranteed alive; validate the run_id FK once
+        # at commit instead of per inserted row (pragma resets on commit)
+        self.conn.execute("PRAGMA defer_foreign_keys = ON")
+        self.conn.executemany(_SQL_TRACK_KEYS_BATCH,
+                              [(system, key, norm_key, run_id, run_id)
+                               for system, key, norm_key in keys_data])
         # Don't commit here - let the caller decide when to commit
 
     def log_event(self, run_id: int, event_type: str, event_details: str,
                   system_name: Optional[str] = None, key_value: Optional[str] = None,
                   action_taken: Optional[str] = None, result: Optional[str] = None):
         """Log an audit event."""
-        self.conn.execute("""
-            INSERT INTO audit_log
-            (run_id, event_type, event_details, system_name, key_value, action_taken, result)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (run_id, event_type, event_details, system_name, key_value, action_taken, result))
-        self.conn.commit()
+        if event_details is not None:
+            event_details = self._event_details_interned.setdefault(
+                event_details, event_details)
+        self.conn.execute(_SQL_LOG_EVENT,
+                          (run_id, event_type, event_details, system_name,
+                           key_value, action_taken, result))
+        # Don't commit here - let the caller decide when to commit
+
+    def log_events_bulk(self, run_id: int, events: List[Dict[str, Any]]):
+        """Log multiple audit events in a single batch operation."""
+        self.conn.execute("PRAGMA defer_foreign_keys = ON")
+        self.conn.executemany(_SQL_LOG_EVENT, [
+              (run_id, event['event_type'], event.get('event_details'),
+               event.get('system_name'), event.get('key_value'),
+               event.get('action_taken'), event.get('result'))
+              for event in events])
+        # Don't commit here - let the caller decide when to commit
 
-    def get_master_keys(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get master keys by status."""
+    @staticmethod
+    def _master_keys_query(status: Optional[str], limit: Optional[int],
+                           run_id: Optional[int]) -> Tuple[str, Tuple[Any, ...]]:
+        """Build the master key SELECT shared by the list and stream paths."""
         query = "SELECT * FROM master_key_registry"
-        params = ()
+        conditions = []
+        params: Tuple[Any, ...] = ()
+        if run_id is not None:
+            conditions.append("run_id = ?")
+            params = params + (run_id,)
         if status:
-            query += " WHERE status = ?"
-            params = (status,)
+            conditions.append("status = ?")
+            params = params + (status,)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
         query += " ORDER BY created_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params = params + (limit,)
+        return query, params
+
+    def get_master_keys(self, status: Optional[str] = None,
+                        limit: Optional[int] = None,
+                        run_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get committed master keys via the pooled read connections.
 
-        cursor = self.conn.execute(query, params)
-        return [dict(row) for row in cursor.fetchall()]
+        run_id and status filter in SQL (served by the (run_id, status)
+        index) so only the requested rows cross the connection.
+        """
+        query, params = self._master_keys_query(status, limit, run_id)
+        with self.read() as conn:
+            return [dict(row) for row in conn.execute(query, params)]
+
+    def iter_master_keys(self, status: Optional[str] = None,
+                         limit: Optional[int] = None,
+                         run_id: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Stream master keys one row at a time instead of materializing all.
+
+        Runs on the write connection so in-flight (uncommitted) proposals
+        are visible to mid-run callers such as the provisioner.
+        """
+        query, params = self._master_keys_query(status, limit, run_id)
+        for row in self.conn.execute(query, params):
+            yield dict(row)
+
+    def count_master_keys(self, run_id: int, status: str) -> int:
+        """Count a run's master keys by status via the (run_id, status) index."""
+        row = self.conn.execute("""
+            SELECT COUNT(*) FROM master_key_registry
+            WHERE run_id = ? AND status = ?
+        """, (run_id, status)).fetchone()
+        return row[0]
+
+    def count_master_keys_by_status(self, run_id: int) -> Dict[str, int]:
+        """Get per-status master key counts for a run in a single query."""
+        cursor = self.conn.execute("""
+            SELECT status, COUNT(*) FROM master_key_registry
+            WHERE run_id = ?
+            GROUP BY status
+        """, (run_id,))
+        return {row[0]: row[1] for row in cursor}
 
     def commit(self):
         """Commit the current transaction."""
@@ -239,6 +524,18 @@ class Database:
             self.conn.commit()
 
     def close(self):
-        """Close database connection."""
+        """Close database connections once the last alias lets go."""
+        self._alias_count -= 1
+        if self._alias_count > 0:
+            return
+        if self._registry_key is not None:
+            _open_dbs().pop(self._registry_key, None)
+            self._registry_key = None
+        while True:
+            try:
+                self._read_conns.get_nowait().close()
+            except queue.Empty:
+                break
+        self._read_conns_created = 0
         if self.conn:
             self.conn.close()
\ No newline at end of file
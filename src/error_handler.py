@@ -1,8 +1,10 @@
 """Error handling and resilience module for KeySync Mini."""
 
 import logging
+import random
 import time
 import csv
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, Optional, Dict, List
 from functools import wraps
@@ -86,7 +88,7 @@ class ErrorHandler:
             logger.warning(f"Corrupt data in {file_path} row {row_num}: {error}")
             return True  # Continue processing
         elif policy == 'skip':
-            logger.debug(f"Skipping corrupt row {row_num} in {file_path}")
+            logger.debug("Skipping corrupt row %d in %s", row_num, file_path)
             return True  # Continue processing
         elif policy == 'fail':
             raise DataValidationError(f"Corrupt data in {file_path} row {row_num}: {error}")
@@ -112,30 +114,32 @@ class ErrorHandler:
 
         try:
             with open(path, 'r', newline='') as f:
-                reader = csv.DictReader(f)
+                # csv.reader returns plain lists; DictReader would allocate a
+                # dict per row just to read one field
+                reader = csv.reader(f)
+                header = next(reader, None) or []
 
                 # Check for required headers
-                if 'key' not in reader.fieldnames:
+                try:
+                    key_idx = header.index('key')
+                except ValueError:
                     validation_result['warnings'].append("Missing 'key' column")
+                    key_idx = None
 
+                total_rows = 0
+                valid_rows = 0
+                error_rows = validation_result['error_rows']
                 for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is 1)
-                    validation_result['total_rows'] += 1
-
-                    try:
-                        # Validate row has key field
-                        if not row.get('key'):
-                            validation_result['error_rows'].append({
-                                'row': row_num,
-                                'error': 'Empty key field'
-                            })
-                        else:
-                            validation_result['valid_rows'] += 1
-
-                    except Exception as e:
-                        validation_result['error_rows'].append({
+                    total_rows += 1
+                    if key_idx is not None and key_idx < len(row) and row[key_idx]:
+                        valid_rows += 1
+                    else:
+                        error_rows.append({
                             'row': row_num,
-                            'error': str(e)
+                            'error': 'Empty key field'
                         })
+                validation_result['total_rows'] = total_rows
+                validation_result['valid_rows'] = valid_rows
 
         except Exception as e:
             validation_result['valid'] = False
@@ -147,10 +151,17 @@ class ErrorHandler:
 
         return validation_result
 
-    def with_retry(self, func: Callable, *args, **kwargs) -> Any:
-        """Execute function with retry logic."""
+    def with_retry(self, func: Callable, *args,
+                   retriable_exceptions: tuple = (Exception,), **kwargs) -> Any:
+        """Execute function with retry logic.
+
+        Delays grow exponentially with random jitter so concurrent callers
+        don't retry in lockstep. Exceptions outside ``retriable_exceptions``
+        are raised immediately without burning retry attempts.
+        """
         max_attempts = self.config.get('retry_attempts', 3)
         delay = self.config.get('retry_delay_seconds', 5)
+        max_delay = self.config.get('retry_max_delay_seconds', 60)
 
         func_name = func.__name__
         if func_name not in self.recovery_attempts:
@@ -164,14 +175,16 @@ class ErrorHandler:
                     logger.info(f"Successfully executed {func_name} after {attempt} attempts")
                 return result
 
-            except Exception as e:
+            except retriable_exceptions as e:
                 last_error = e
                 self.recovery_attempts[func_name] += 1
 
                 if attempt < max_attempts:
+                    sleep_time = min(delay * 2 ** (attempt - 1), max_delay)
+                    sleep_time *= random.uniform(0.5, 1.5)
                     logger.warning(f"Attempt {attempt}/{max_attempts} failed for {func_name}: {e}")
-                    logger.info(f"Retrying in {delay} seconds...")
-                    time.sleep(delay)
+                    logger.info(f"Retrying in {sleep_time:.1f} seconds...")
+                    time.sleep(sleep_time)
                 else:
                     logger.error(f"All {max_attempts} attempts failed for {func_name}")
 
@@ -251,10 +264,15 @@ class ErrorHandler:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
 
-            from datetime import datetime
-            for error in self.error_log:
-                error['timestamp'] = datetime.now().isoformat()
-                writer.writerow({k: error.get(k, '') for k in fieldnames})
+            # One timestamp for the whole report; the stored log entries are
+            # left untouched for downstream consumers
+            report_time = datetime.now().isoformat()
+            value_fields = [k for k in fieldnames if k != 'timestamp']
+            writer.writerows(
+                {'timestamp': report_time,
+                 **{k: error.get(k, '') for k in value_fields}}
+                for error in self.error_log
+            )
 
         logger.info(f"Error report created: {file_path}")
         return str(file_path)
@@ -21,6 +21,18 @@ from reporter import Reporter
 logger = get_logger(__name__)
 
 
+class _LazyJson:
+    """Defer json.dumps until a handler actually formats the log record."""
+
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return json.dumps(self.obj, separators=(',', ':'), default=str)
+
+
 def run_reconciliation(
     config: str = 'keysync-config.yaml',
     mode: str = 'full',
@@ -102,17 +114,21 @@ def run_reconciliation(
             )
             logger.info(
                 "Mock data generated: %s",
-                json.dumps(generated_data_stats['systems'], indent=2)
+                _LazyJson(generated_data_stats['systems'])
             )
 
         # Initialize components
         logger.info("Initializing components...")
-        db = Database(db_path=cfg.get('database.path', 'data/keysync.db'))
+        # Dry runs never persist anything, so skip the on-disk database (and
+        # its WAL fsyncs) entirely
+        db_path = ':memory:' if dry_run else cfg.get('database.path', 'data/keysync.db')
+        db = Database(db_path=db_path)
         normalizer = Normalizer(config=cfg.get_section('normalize'))
         comparator = Comparator(
             normalizer=normalizer,
             parallel=cfg.get('processing.parallel', True),
-            batch_size=cfg.get('processing.batch_size', 1000)
+            batch_size=cfg.get('processing.batch_size', 1000),
+            max_workers=cfg.get('processing.max_workers', 5)
         )
         provisioner = Provisioner(
             database=db,
@@ -127,15 +143,18 @@ def run_reconciliation(
             comparator=comparator,
             provisioner=provisioner,
             config={
+                'input_dir': 'input',
+                **cfg.get_section('processing'),
+                # The processing section carries a default 'mode'; the
+                # runtime selection must win or --mode incremental is lost
                 'mode': mode,
                 'execution_mode': execution_mode,
-                'input_dir': 'input',
-                **cfg.get_section('processing')
             }
         )
         reporter = Reporter(
             database=db,
-            output_dir=cfg.get('output.directory', 'output')
+            output_dir=cfg.get('output.directory', 'output'),
+            output_format=cfg.get('output.format', 'csv')
         )
 
         system_files = cfg.get_system_files()
@@ -177,7 +196,7 @@ def run_reconciliation(
 
         final_stats = reconciler.get_run_summary()
         logger.info(f"Run {run_id} completed successfully")
-        logger.info(f"Statistics: {json.dumps(final_stats, indent=2, default=str)}")
+        logger.info("Statistics: %s", _LazyJson(final_stats))
 
         output_path = cfg.get('output.directory', 'output')
 
@@ -253,44 +272,46 @@ def main(config, mode, dry_run, auto_approve, generate_data, scenario, keys, see
 
 def print_summary(results: dict, dry_run: bool = False):
     """Print reconciliation summary to console."""
-    print("\n" + "=" * 60)
-    print("RECONCILIATION SUMMARY")
-    print("=" * 60)
-
     stats = results.get('comparison', {}).get('statistics', {})
     discrepancies = results.get('discrepancies', {}).get('summary', {})
 
-    print(f"Timestamp: {results.get('timestamp', datetime.now().isoformat())}")
-    print(f"Mode: {'DRY-RUN' if dry_run else 'NORMAL'}")
-    print()
-
-    print("KEY STATISTICS:")
-    print(f"  Total Unique Keys: {stats.get('total_unique_keys', 0)}")
-    print(f"  Keys in System A: {stats.get('keys_in_a', 0)}")
-    print(f"  Keys in All Systems: {stats.get('keys_in_all_systems', 0)}")
-    print(f"  Overall Match Rate: {stats.get('match_percentage', 0):.1f}%")
-    print()
-
-    print("DISCREPANCIES FOUND:")
-    print(f"  Out of Authority Keys: {discrepancies.get('total_out_of_authority', 0)}")
-    print(f"  Propagation Gaps: {discrepancies.get('total_propagation_gaps', 0)}")
-    print(f"  Duplicate Key Groups: {discrepancies.get('total_duplicate_groups', 0)}")
-    print()
+    # Assemble the whole summary and emit it with a single write: one
+    # stdio lock acquisition and one syscall instead of ~25
+    lines = [
+        "",
+        "=" * 60,
+        "RECONCILIATION SUMMARY",
+        "=" * 60,
+        f"Timestamp: {results.get('timestamp', datetime.now().isoformat())}",
+        f"Mode: {'DRY-RUN' if dry_run else 'NORMAL'}",
+        "",
+        "KEY STATISTICS:",
+        f"  Total Unique Keys: {stats.get('total_unique_keys', 0)}",
+        f"  Keys in System A: {stats.get('keys_in_a', 0)}",
+        f"  Keys in All Systems: {stats.get('keys_in_all_systems', 0)}",
+        f"  Overall Match Rate: {stats.get('match_percentage', 0):.1f}%",
+        "",
+        "DISCREPANCIES FOUND:",
+        f"  Out of Authority Keys: {discrepancies.get('total_out_of_authority', 0)}",
+        f"  Propagation Gaps: {discrepancies.get('total_propagation_gaps', 0)}",
+        f"  Duplicate Key Groups: {discrepancies.get('total_duplicate_groups', 0)}",
+        "",
+    ]
 
     if results.get('provisioning'):
-        prov_count = len(results['provisioning'])
-        print(f"MASTER KEYS PROPOSED: {prov_count}")
+        lines.append(f"MASTER KEYS PROPOSED: {len(results['provisioning'])}")
         if dry_run:
-            print("  (Not persisted - dry run mode)")
+            lines.append("  (Not persisted - dry run mode)")
     else:
-        print("MASTER KEYS PROPOSED: 0")
+        lines.append("MASTER KEYS PROPOSED: 0")
 
-    print()
-    print("SYSTEM COUNTS:")
+    lines.append("")
+    lines.append("SYSTEM COUNTS:")
     for system, count in sorted(stats.get('system_counts', {}).items()):
-        print(f"  System {system}: {count} keys")
+        lines.append(f"  System {system}: {count} keys")
 
-    print("=" * 60 + "\n")
+    lines.append("=" * 60 + "\n")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == '__main__':
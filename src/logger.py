@@ -8,15 +8,27 @@ import sys
 
 
 def setup_logging(log_level: str = "INFO", log_file: str = None) -> None:
-    """Set up logging configuration for the application."""
+    """Set up logging configuration for the application.
+
+    Calling this again with the same configuration is a no-op, so repeated
+    setup (tests, worker processes) doesn't tear down and reopen handlers.
+    """
+    root_logger = logging.getLogger()
+    config_tag = (log_level.upper(), log_file)
+
+    # Idempotency guard: reuse handlers installed for this exact config
+    if root_logger.handlers and all(
+        getattr(handler, '_keysync_cfg', None) == config_tag
+        for handler in root_logger.handlers
+    ):
+        return
+
     # Create formatter
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%dT%H:%M:%S'
     )
 
-    # Get root logger
-    root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level.upper()))
 
     # Clear existing handlers
@@ -25,6 +37,7 @@ def setup_logging(log_level: str = "INFO", log_file: str = None) -> None:
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
+    console_handler._keysync_cfg = config_tag
     root_logger.addHandler(console_handler)
 
     # File handler (if specified)
@@ -38,6 +51,7 @@ def setup_logging(log_level: str = "INFO", log_file: str = None) -> None:
             backupCount=5
         )
         file_handler.setFormatter(formatter)
+        file_handler._keysync_cfg = config_tag
         root_logger.addHandler(file_handler)
 
 
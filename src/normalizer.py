@@ -4,6 +4,11 @@ import re
 import logging
 from typing import Dict, Any, List, Optional
 
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover - pandas is a core dependency
+    pd = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,14 +20,37 @@ class Normalizer:
         base_config = self._get_default_config()
         self._using_default_config = config is None
         self._explicit_config_keys = set(config.keys()) if isinstance(config, dict) else set()
+        # Original constructor argument, kept so worker processes can rebuild
+        # an equivalent Normalizer (merged config would alter pad semantics)
+        self._init_config = dict(config) if isinstance(config, dict) else None
         self.config = base_config.copy()
         if config:
             self.config.update(config)
         self.stats = {
             'total_normalized': 0,
+            'fast_path_hits': 0,
             'transformations_applied': {}
         }
 
+        # Config is fixed after construction, so resolve rule flags and
+        # compile the patterns once instead of per normalize() call
+        self._do_trim = bool(self.config.get('trim_whitespace', True))
+        self._do_upper = bool(self.config.get('uppercase', True))
+        self._do_strip = bool(self.config.get('strip_non_alnum', True))
+        self._do_pad = self._pad_numbers_enabled()
+        self._collapse_delim = self.config.get('collapse_delims')
+        self._collapse_re = re.compile(r'[_\s-]+') if self._collapse_delim else None
+        allowed_chars = self._collapse_delim if self._collapse_delim else '-'
+        self._strip_re = re.compile(f'[^A-Z0-9{re.escape(allowed_chars)}]')
+        self._pad_re = re.compile(r'\b(\d+)\b')
+        pad_length = self.config.get('pad_length', 6)
+        self._pad_repl = lambda match: match.group(1).zfill(pad_length)
+
+        # Characters untouched by the trim/upper/collapse/strip passes; keys
+        # made only of these (with no delimiter runs) skip straight to padding
+        self._clean_chars = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789' + allowed_chars)
+        self._delim_run = allowed_chars * 2 if self._collapse_re is not None else None
+
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default normalization configuration."""
         return {
@@ -39,66 +67,57 @@ class Normalizer:
         if not key:
             return ''
 
+        # Fast path for keys already in canonical form: real data is mostly
+        # clean, so most keys only need the padding check
+        if self._clean_chars.issuperset(key) and (
+                self._delim_run is None or self._delim_run not in key):
+            self.stats['total_normalized'] += 1
+            self.stats['fast_path_hits'] += 1
+            if self._do_pad:
+                new_key = self._pad_re.sub(self._pad_repl, key)
+                if new_key != key:
+                    self.stats['transformations_applied']['pad_numbers'] = \
+                        self.stats['transformations_applied'].get('pad_numbers', 0) + 1
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Normalized: '%s' -> '%s' (transforms: %s)",
+                                     key, new_key, ['pad_numbers'])
+                    return new_key
+            return key
+
         original = key
         transformations = []
 
         # Trim whitespace
-        if self.config.get('trim_whitespace', True):
+        if self._do_trim:
             key = key.strip()
             if key != original:
                 transformations.append('trim')
 
         # Convert to uppercase
-        if self.config.get('uppercase', True):
+        if self._do_upper:
             new_key = key.upper()
             if new_key != key:
                 transformations.append('uppercase')
             key = new_key
 
-        # Collapse multiple delimiters
-        collapse_delim = self.config.get('collapse_delims')
-        if collapse_delim:
-            # Replace multiple spaces, underscores, hyphens with single delimiter
-            patterns = [
-                (r'\s+', collapse_delim),
-                (r'_+', collapse_delim),
-                (r'-+', collapse_delim),
-                (r'[_\s-]+', collapse_delim)  # Mixed delimiters
-            ]
-            for pattern, replacement in patterns:
-                new_key = re.sub(pattern, replacement, key)
-                if new_key != key:
-                    transformations.append('collapse_delims')
-                    key = new_key
-                    break
+        # Collapse runs of spaces, underscores and hyphens (mixed included)
+        # into a single delimiter
+        if self._collapse_re is not None:
+            new_key = self._collapse_re.sub(self._collapse_delim, key)
+            if new_key != key:
+                transformations.append('collapse_delims')
+            key = new_key
 
-        # Strip non-alphanumeric characters
-        if self.config.get('strip_non_alnum', True):
-            # Keep only alphanumeric and the collapse delimiter
-            allowed_chars = collapse_delim if collapse_delim else '-'
-            new_key = re.sub(f'[^A-Z0-9{re.escape(allowed_chars)}]', '', key)
+        # Strip non-alphanumeric characters (the collapse delimiter is kept)
+        if self._do_strip:
+            new_key = self._strip_re.sub('', key)
             if new_key != key:
                 transformations.append('strip_non_alnum')
             key = new_key
 
-        # Left-pad numbers
-        if self._using_default_config:
-            pad_numbers_enabled = self.config.get('left_pad_numbers', True)
-        else:
-            if 'left_pad_numbers' in self._explicit_config_keys:
-                pad_numbers_enabled = bool(self.config.get('left_pad_numbers'))
-            else:
-                pad_numbers_enabled = False
-
-        if pad_numbers_enabled:
-            pad_length = self.config.get('pad_length', 6)
-
-            def pad_numbers(match):
-                num = match.group(1)
-                return num.zfill(pad_length)
-
-            # Find standalone numbers and pad them
-            new_key = re.sub(r'\b(\d+)\b', pad_numbers, key)
+        # Left-pad standalone numbers
+        if self._do_pad:
+            new_key = self._pad_re.sub(self._pad_repl, key)
             if new_key != key:
                 transformations.append('pad_numbers')
             key = new_key
@@ -109,14 +128,74 @@ class Normalizer:
             self.stats['transformations_applied'][transform] = \
                 self.stats['transformations_applied'].get(transform, 0) + 1
 
-        if original != key:
-            logger.debug(f"Normalized: '{original}' -> '{key}' (transforms: {transformations})")
+        if original != key and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Normalized: '%s' -> '%s' (transforms: %s)",
+                         original, key, transformations)
 
         return key
 
+    def _pad_numbers_enabled(self) -> bool:
+        """Determine whether number padding applies for this configuration."""
+        if self._using_default_config:
+            return self.config.get('left_pad_numbers', True)
+        if 'left_pad_numbers' in self._explicit_config_keys:
+            return bool(self.config.get('left_pad_numbers'))
+        return False
+
     def normalize_batch(self, keys: List[str]) -> List[str]:
-        """Normalize a batch of keys."""
-        return [self.normalize(key) for key in keys]
+        """Normalize a batch of keys.
+
+        Uses vectorized pandas string operations so the whole batch runs
+        through the C implementations instead of per-key Python dispatch.
+        Falls back to the scalar path when pandas is unavailable.
+        """
+        if pd is None or not keys:
+            return [self.normalize(key) for key in keys]
+
+        series = pd.Series(keys, dtype='object').fillna('')
+        non_empty = series != ''
+        transformations = {}
+
+        # Trim whitespace
+        if self._do_trim:
+            trimmed = series.str.strip()
+            transformations['trim'] = int(((trimmed != series) & non_empty).sum())
+            series = trimmed
+
+        # Convert to uppercase
+        if self._do_upper:
+            upper = series.str.upper()
+            transformations['uppercase'] = int(((upper != series) & non_empty).sum())
+            series = upper
+
+        # Collapse delimiter runs (same combined pattern as the scalar path)
+        if self._collapse_re is not None:
+            collapsed = series.str.replace(
+                self._collapse_re, self._collapse_delim, regex=True
+            )
+            transformations['collapse_delims'] = int(((collapsed != series) & non_empty).sum())
+            series = collapsed
+
+        # Strip non-alphanumeric characters
+        if self._do_strip:
+            stripped = series.str.replace(self._strip_re, '', regex=True)
+            transformations['strip_non_alnum'] = int(((stripped != series) & non_empty).sum())
+            series = stripped
+
+        # Left-pad numbers
+        if self._do_pad:
+            padded = series.str.replace(self._pad_re, self._pad_repl, regex=True)
+            transformations['pad_numbers'] = int(((padded != series) & non_empty).sum())
+            series = padded
+
+        # Update statistics (empty keys are skipped, matching normalize())
+        self.stats['total_normalized'] += int(non_empty.sum())
+        for transform, count in transformations.items():
+            if count:
+                self.stats['transformations_applied'][transform] = \
+                    self.stats['transformations_applied'].get(transform, 0) + count
+
+        return series.tolist()
 
     def normalize_with_mapping(self, keys: List[str]) -> Dict[str, str]:
         """Normalize keys and return mapping of original to normalized."""
@@ -126,10 +205,19 @@ class Normalizer:
             mapping[key] = normalized
         return mapping
 
+    def merge_stats(self, other_stats: Dict[str, Any]):
+        """Merge additive stats from another Normalizer (e.g. a pool worker)."""
+        self.stats['total_normalized'] += other_stats.get('total_normalized', 0)
+        self.stats['fast_path_hits'] += other_stats.get('fast_path_hits', 0)
+        transformations = self.stats['transformations_applied']
+        for transform, count in other_stats.get('transformations_applied', {}).items():
+            transformations[transform] = transformations.get(transform, 0) + count
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get normalization statistics."""
         return {
             'total_normalized': self.stats['total_normalized'],
+            'fast_path_hits': self.stats['fast_path_hits'],
             'transformations': self.stats['transformations_applied'],
             'configuration': self.config
         }
@@ -138,5 +226,6 @@ class Normalizer:
         """Reset normalization statistics."""
         self.stats = {
             'total_normalized': 0,
+            'fast_path_hits': 0,
             'transformations_applied': {}
         }
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""Per-process normalization state for parallel comparison workers."""
+
+from typing import Any, Dict, Optional
+
+from normalizer import Normalizer
+
+# Initialized once per worker process via the pool's initializer so each
+# task reuses the same Normalizer instead of rebuilding one per submission.
+_WORKER_NORMALIZER: Optional[Normalizer] = None
+
+
+def init_worker(normalizer_config: Optional[Dict[str, Any]]) -> None:
+    """Pool initializer: build the process-wide Normalizer once."""
+    global _WORKER_NORMALIZER
+    _WORKER_NORMALIZER = Normalizer(normalizer_config)
+
+
+def get_worker_normalizer() -> Normalizer:
+    """Return the process-wide Normalizer set up by init_worker."""
+    if _WORKER_NORMALIZER is None:
+        raise RuntimeError("Worker normalizer not initialized; pool must pass init_worker")
+    return _WORKER_NORMALIZER
@@ -65,19 +65,21 @@ class Provisioner:
         Returns:
             List of proposed master key records
         """
-        proposed_keys = []
+        # Fetch the registry once up front; one scan instead of one per key
+        existing_normalized = {
+            master['master_key']
+            for master in self.db.iter_master_keys()
+            if master['status'] in ['proposed', 'active']
+        }
+
+        strategy = self.config.get('strategy', 'mirror')
+        pending_rows = []
+        pending_records = []
 
         for normalized_key, system_keys in out_of_authority_keys.items():
             # Check if master key already exists
-            existing_masters = self.db.get_master_keys()
-            existing_normalized = {
-                master['master_key']: master
-                for master in existing_masters
-                if master['status'] in ['proposed', 'active']
-            }
-
             if normalized_key in existing_normalized:
-                logger.info(f"Master key already exists for '{normalized_key}', skipping")
+                logger.info("Master key already exists for '%s', skipping", normalized_key)
                 self.stats['keys_skipped'] += 1
                 continue
 
@@ -87,31 +89,52 @@ class Provisioner:
             # Generate master key
             master_key = self.generate_master_key(source_system, source_key, normalized_key)
 
-            # Propose the master key
-            try:
-                master_key_id = self.db.propose_master_key(
-                    run_id=run_id,
-                    master_key=master_key,
-                    source_system=source_system,
-                    source_key=source_key,
-                    strategy=self.config.get('strategy', 'mirror')
-                )
-
-                proposed_keys.append({
-                    'master_key_id': master_key_id,
-                    'master_key': master_key,
-                    'source_system': source_system,
-                    'source_key': source_key,
-                    'normalized_key': normalized_key,
-                    'affected_systems': [s for s, _ in system_keys],
-                    'status': 'proposed'
-                })
-
-                self.stats['keys_proposed'] += 1
-                logger.info(f"Proposed master key: '{master_key}' for normalized key '{normalized_key}'")
-
-            except Exception as e:
-                logger.error(f"Failed to propose master key for '{normalized_key}': {e}")
+            pending_rows.append((master_key, source_system, source_key, strategy))
+            pending_records.append({
+                'master_key_id': None,
+                'master_key': master_key,
+                'source_system': source_system,
+                'source_key': source_key,
+                'normalized_key': normalized_key,
+                'affected_systems': [s for s, _ in system_keys],
+                'status': 'proposed'
+            })
+
+            # Keep later iterations in this batch deduping correctly
+            existing_normalized.add(master_key)
+
+        if not pending_rows:
+            return []
+
+        # Insert the whole batch through one prepared statement; fall back to
+        # per-row inserts so a single bad row doesn't sink the batch
+        try:
+            master_key_ids = self.db.propose_master_keys_bulk(run_id, pending_rows)
+        except Exception as e:
+            logger.warning(f"Bulk proposal failed ({e}), retrying row by row")
+            master_key_ids = []
+            for master_key, source_system, source_key, row_strategy in pending_rows:
+                try:
+                    master_key_ids.append(self.db.propose_master_key(
+                        run_id=run_id,
+                        master_key=master_key,
+                        source_system=source_system,
+                        source_key=source_key,
+                        strategy=row_strategy
+                    ))
+                except Exception as row_error:
+                    logger.error(f"Failed to propose master key '{master_key}': {row_error}")
+                    master_key_ids.append(None)
+
+        proposed_keys = []
+        for record, master_key_id in zip(pending_records, master_key_ids):
+            if master_key_id is None:
+                continue
+            record['master_key_id'] = master_key_id
+            proposed_keys.append(record)
+            self.stats['keys_proposed'] += 1
+            logger.info("Proposed master key: '%s' for normalized key '%s'",
+                        record['master_key'], record['normalized_key'])
 
         return proposed_keys
 
@@ -135,11 +158,8 @@ class Provisioner:
         try:
             self.db.activate_master_keys(run_id)
 
-            # Count activated keys
-            activated = len([
-                k for k in self.db.get_master_keys()
-                if k.get('run_id') == run_id and k['status'] == 'active'
-            ])
+            # Count activated keys with an indexed query
+            activated = self.db.count_master_keys(run_id, 'active')
 
             self.stats['keys_activated'] += activated
             logger.info(f"Activated {activated} master keys from run {run_id}")
@@ -151,14 +171,12 @@ class Provisioner:
 
     def get_provisioning_summary(self, run_id: int) -> Dict[str, Any]:
         """Get summary of provisioning for a run."""
-        all_masters = self.db.get_master_keys()
-
-        run_masters = [k for k in all_masters if k.get('run_id') == run_id]
+        status_counts = self.db.count_master_keys_by_status(run_id)
 
         summary = {
             'run_id': run_id,
-            'total_proposed': len([k for k in run_masters if k['status'] == 'proposed']),
-            'total_activated': len([k for k in run_masters if k['status'] == 'active']),
+            'total_proposed': status_counts.get('proposed', 0),
+            'total_activated': status_counts.get('active', 0),
             'strategy': self.config.get('strategy', 'mirror'),
             'auto_approve': self.config.get('auto_approve', False),
             'stats': self.stats.copy()
@@ -1,13 +1,15 @@
 """Reconciliation engine for KeySync Mini."""
 
+import json
 import logging
+from collections import defaultdict
 from typing import Dict, List, Set, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
 from database import Database
 from normalizer import Normalizer
-from comparator import Comparator
+from comparator import Comparator, iter_original_keys
 from provisioner import Provisioner
 
 logger = logging.getLogger(__name__)
@@ -32,6 +34,9 @@ class Reconciler:
         self.config = config or {}
         self.run_id = None
         self.checkpoint_data = {}
+        # Per-system frozensets of normalized keys from the latest
+        # comparison; persisted on completion for incremental diffing
+        self.system_key_sets: Dict[str, frozenset] = {}
 
     def start_reconciliation(
         self,
@@ -72,6 +77,7 @@ class Reconciler:
             event_type='run_started',
             event_details=f"Reconciliation started in {mode} mode with {execution_mode} execution"
         )
+        self.db.commit()
 
         return self.run_id
 
@@ -92,6 +98,12 @@ class Reconciler:
             comparison_results = self.comparator.compare_all_systems(system_files)
             results['comparison'] = comparison_results
 
+            # Snapshot per-system key sets for incremental diffing
+            self.system_key_sets = {
+                name: frozenset(norm_map)
+                for name, norm_map in comparison_results['system_keys'].items()
+            }
+
             # Save checkpoint
             self.save_checkpoint('comparison_complete', comparison_results)
 
@@ -148,6 +160,8 @@ class Reconciler:
                 event_details=str(e),
                 result='failure'
             )
+            # Persist the failure event before propagating
+            self.db.commit()
             raise
 
         # Commit all database changes at once for better performance
@@ -163,46 +177,65 @@ class Reconciler:
             'summary': {}
         }
 
-        comparison = comparison_results.get('comparison', {})
-        system_keys = comparison_results.get('system_keys', {})
-
-        # Out-of-authority keys (need master key provisioning)
-        keys_missing_in_a = comparison.get('keys_missing_in_a', set())
-        for key in keys_missing_in_a:
-            source_systems = []
-            for system_name, norm_map in system_keys.items():
-                if system_name != 'A' and key in norm_map:
-                    # Get original keys for this normalized key
-                    for orig_key in norm_map[key]:
-                        source_systems.append((system_name, orig_key))
-
-            if source_systems:
-                discrepancies['out_of_authority_keys'][key] = source_systems
+        # compare_all_systems guarantees this schema; direct subscripts keep
+        # the hot loops free of fallback-object allocations
+        assert 'comparison' in comparison_results and 'system_keys' in comparison_results
+        comparison = comparison_results['comparison']
+        system_keys = comparison_results['system_keys']
+
+        # Out-of-authority keys (need master key provisioning). Build a
+        # reverse index normalized_key -> {(system, original)} in one pass
+        # per system instead of probing every system for every missing key;
+        # each system walks whichever side (missing set or its own map) is
+        # smaller. Sets dedupe repeated (system, original) pairs up front.
+        keys_missing_in_a = comparison['keys_missing_in_a']
+        missing = (keys_missing_in_a if isinstance(keys_missing_in_a, (set, frozenset))
+                   else set(keys_missing_in_a))
+        reverse_index: Dict[str, set] = defaultdict(set)
+        for system_name, norm_map in system_keys.items():
+            if system_name == 'A':
+                continue
+            if len(missing) <= len(norm_map):
+                candidates = ((key, norm_map[key]) for key in missing if key in norm_map)
+            else:
+                candidates = ((key, origs) for key, origs in norm_map.items()
+                              if key in missing)
+            for key, origs in candidates:
+                entry = reverse_index[key]
+                for orig_key in iter_original_keys(origs):
+                    entry.add((system_name, orig_key))
+
+        for key, source_systems in reverse_index.items():
+            # Sorted for a deterministic source-system choice downstream
+            discrepancies['out_of_authority_keys'][key] = sorted(source_systems)
+
+        # Propagation gaps and duplicates, counting as we go so the summary
+        # below doesn't need a second pass over either dict
+        gaps_total = 0
+        dup_total = 0
+        affected_systems = set()
 
         # Propagation gaps (keys in A but not fully propagated)
-        system_gaps = comparison.get('system_specific_gaps', {})
+        system_gaps = comparison['system_specific_gaps']
         for system_name, missing_keys in system_gaps.items():
             if missing_keys:
                 discrepancies['propagation_gaps'][system_name] = list(missing_keys)
+                gaps_total += len(missing_keys)
+                affected_systems.add(system_name)
 
         # Duplicate keys
-        duplicates = comparison_results.get('statistics', {}).get('duplicates', {})
+        duplicates = comparison_results['statistics']['duplicates']
         for system_name, dup_groups in duplicates.items():
             discrepancies['duplicate_keys'][system_name] = dup_groups
+            dup_total += len(dup_groups)
+            affected_systems.add(system_name)
 
         # Summary statistics
         discrepancies['summary'] = {
             'total_out_of_authority': len(discrepancies['out_of_authority_keys']),
-            'total_propagation_gaps': sum(
-                len(gaps) for gaps in discrepancies['propagation_gaps'].values()
-            ),
-            'total_duplicate_groups': sum(
-                len(dups) for dups in discrepancies['duplicate_keys'].values()
-            ),
-            'affected_systems': list(set(
-                list(discrepancies['propagation_gaps'].keys()) +
-                list(discrepancies['duplicate_keys'].keys())
-            ))
+            'total_propagation_gaps': gaps_total,
+            'total_duplicate_groups': dup_total,
+            'affected_systems': sorted(affected_systems)
         }
 
         logger.info(f"Discrepancy analysis complete: {discrepancies['summary']}")
@@ -211,38 +244,77 @@ class Reconciler:
 
     def track_keys(self, comparison_results: Dict[str, Any]):
         """Track keys in database for temporal analysis."""
-        system_keys = comparison_results.get('system_keys', {})
+        system_keys = comparison_results['system_keys']
 
         # Collect all keys for batch insertion
         keys_batch = []
         for system_name, norm_map in system_keys.items():
             for normalized_key, original_keys in norm_map.items():
-                for orig_key in original_keys:
+                for orig_key in iter_original_keys(original_keys):
                     keys_batch.append((system_name, orig_key, normalized_key))
 
         # Use batch insertion for better performance
         if keys_batch:
             self.db.track_keys_batch(self.run_id, keys_batch)
 
-        logger.info(f"Tracked {sum(len(m) for m in system_keys.values())} keys for temporal analysis")
+        # The batch list already holds one entry per tracked row; no need
+        # for a second pass over the system maps just to count
+        logger.info(f"Tracked {len(keys_batch)} keys for temporal analysis")
 
     def calculate_incremental_changes(
         self,
         current_results: Dict[str, Any],
         last_run: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Calculate changes since last run for incremental mode."""
+        """Calculate changes since last run for incremental mode.
+
+        Diffs the per-system frozensets persisted by the previous run
+        against the current comparison with C-level set operators, so the
+        cost is two hash-set differences per system rather than a Python
+        loop over every key.
+        """
         changes = {
             'new_keys': set(),
             'removed_keys': set(),
             'newly_synchronized': set(),
-            'newly_diverged': set()
+            'newly_diverged': set(),
+            'per_system': {}
         }
 
-        # This would compare current results with last run's results
-        # For now, returning a placeholder structure
         logger.info("Calculating incremental changes from last run")
 
+        cur_sets = {
+            name: frozenset(norm_map)
+            for name, norm_map in current_results['system_keys'].items()
+        }
+        prev_sets: Dict[str, frozenset] = {}
+        checkpoint_json = last_run.get('checkpoint_data')
+        if checkpoint_json:
+            try:
+                saved = json.loads(checkpoint_json).get('system_key_sets', {})
+                prev_sets = {name: frozenset(keys) for name, keys in saved.items()}
+            except (ValueError, TypeError, AttributeError) as e:
+                logger.warning(f"Could not load previous run's key sets: {e}")
+
+        for system_name, cur in cur_sets.items():
+            prev = prev_sets.get(system_name, frozenset())
+            new_keys = cur - prev
+            removed_keys = prev - cur
+            changes['per_system'][system_name] = {
+                'new_keys': new_keys,
+                'removed_keys': removed_keys
+            }
+            changes['new_keys'] |= new_keys
+            changes['removed_keys'] |= removed_keys
+
+        # Keys that entered or left the fully-synchronized state (present
+        # in every system) since the last run
+        if cur_sets and prev_sets:
+            cur_all = frozenset.intersection(*cur_sets.values())
+            prev_all = frozenset.intersection(*prev_sets.values())
+            changes['newly_synchronized'] = cur_all - prev_all
+            changes['newly_diverged'] = prev_all - cur_all
+
         return changes
 
     def save_checkpoint(self, checkpoint_name: str, data: Any):
@@ -251,17 +323,32 @@ class Reconciler:
             'timestamp': datetime.now().isoformat(),
             'data_summary': {
                 'type': type(data).__name__,
-                'size': len(str(data))
+                # Top-level element count; stringifying the whole payload
+                # just to measure it allocated the full repr every step
+                'size': len(data) if hasattr(data, '__len__') else 1
             }
         }
 
         if self.run_id:
-            self.db.save_checkpoint(self.run_id, self.checkpoint_data)
+            # Deferred commit: checkpoints persist with the run's batch
+            # commit (the failure path commits before re-raising), rather
+            # than forcing an fsync per pipeline step
+            self.db.save_checkpoint(self.run_id, self.checkpoint_data,
+                                    commit=False)
             logger.debug(f"Checkpoint saved: {checkpoint_name}")
 
     def complete_reconciliation(self, stats: Dict[str, Any], error: Optional[str] = None):
         """Mark reconciliation run as complete."""
         if self.run_id:
+            if self.system_key_sets and not error:
+                # Persist per-system key sets alongside the checkpoints so
+                # the next incremental run can diff against them
+                self.checkpoint_data['system_key_sets'] = {
+                    name: sorted(keys)
+                    for name, keys in self.system_key_sets.items()
+                }
+                self.db.save_checkpoint(self.run_id, self.checkpoint_data,
+                                        commit=False)
             self.db.complete_run(self.run_id, stats, error)
             logger.info(f"Reconciliation run {self.run_id} completed")
 
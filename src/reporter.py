@@ -3,6 +3,8 @@
 import csv
 import json
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional
@@ -10,17 +12,35 @@ from typing import Dict, List, Any, Optional
 
 from database import Database
 
+try:
+    # Optional columnar output for the large diff reports; CSV is the default
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
 logger = logging.getLogger(__name__)
 
 
 class Reporter:
     """Generate CSV reports for reconciliation results."""
 
-    def __init__(self, database: Database, output_dir: str = 'output'):
-        """Initialize reporter with database and output directory."""
+    def __init__(self, database: Database, output_dir: str = 'output',
+                 output_format: str = 'csv'):
+        """Initialize reporter with database, output directory and format.
+
+        output_format 'parquet' switches the high-volume diff reports to
+        columnar Parquet files (requires pyarrow); everything else, and
+        any setup without pyarrow, writes CSV.
+        """
         self.db = database
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        if output_format == 'parquet' and pa is None:
+            logger.warning("pyarrow not installed, falling back to CSV reports")
+            output_format = 'csv'
+        self.output_format = output_format
         self.reports_generated = []
 
     def generate_all_reports(
@@ -28,42 +48,62 @@ class Reporter:
         run_id: int,
         reconciliation_results: Dict[str, Any]
     ) -> List[str]:
-        """Generate all required CSV reports."""
+        """Generate all required CSV reports.
+
+        The generators are independent (separate output files, read-only
+        database access), so they run concurrently when the database
+        supports pooled reads: SQLite fetches and file writes overlap
+        across threads.
+        """
         self.reports_generated = []
 
-        # 1. Reconciliation Summary
-        summary_file = self.generate_reconciliation_summary(run_id, reconciliation_results)
-        self.reports_generated.append(summary_file)
+        # Fetch the registry once and share it: the missing-in-A report and
+        # the registry dump otherwise each re-query the whole table
+        master_keys = self.db.get_master_keys()
+        master_key_map = {
+            mk['source_key']: mk
+            for mk in master_keys
+            if mk['run_id'] == run_id
+        }
 
-        # 2. Keys missing in A (need master key provisioning)
-        if reconciliation_results.get('discrepancies'):
-            missing_in_a_file = self.generate_missing_in_a_report(
-                run_id,
-                reconciliation_results['discrepancies']
-            )
-            self.reports_generated.append(missing_in_a_file)
+        # (generator, args) pairs; results keep this order
+        tasks = [
+            # 1. Reconciliation Summary
+            (self.generate_reconciliation_summary, (run_id, reconciliation_results)),
+        ]
 
-        # 3. Keys missing from systems (propagation gaps)
         if reconciliation_results.get('discrepancies'):
-            missing_from_systems_file = self.generate_missing_from_systems_report(
-                run_id,
-                reconciliation_results['discrepancies']
-            )
-            self.reports_generated.append(missing_from_systems_file)
+            # 2. Keys missing in A (need master key provisioning)
+            tasks.append((self.generate_missing_in_a_report,
+                          (run_id, reconciliation_results['discrepancies'],
+                           master_key_map)))
+            # 3. Keys missing from systems (propagation gaps)
+            tasks.append((self.generate_missing_from_systems_report,
+                          (run_id, reconciliation_results['discrepancies'])))
 
         # 4. Master key registry
-        registry_file = self.generate_master_key_registry(run_id)
-        self.reports_generated.append(registry_file)
+        tasks.append((self.generate_master_key_registry, (run_id, master_keys)))
 
         # 5. Audit log
-        audit_file = self.generate_audit_log(run_id)
-        self.reports_generated.append(audit_file)
+        tasks.append((self.generate_audit_log, (run_id,)))
 
         # 6. Optional: Trend analysis (if enabled)
         if reconciliation_results.get('enable_trend_analysis'):
-            trend_file = self.generate_trend_analysis(run_id)
-            if trend_file:
-                self.reports_generated.append(trend_file)
+            tasks.append((self.generate_trend_analysis, (run_id,)))
+
+        if self.db.supports_concurrent_reads and len(tasks) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(len(tasks), os.cpu_count() or 1)
+            ) as executor:
+                futures = [executor.submit(fn, *args) for fn, args in tasks]
+                report_files = [future.result() for future in futures]
+        else:
+            # In-memory databases are bound to the creating thread
+            report_files = [fn(*args) for fn, args in tasks]
+
+        # Generators return None when they have nothing to report (no
+        # discrepancies, empty registry, no trend history)
+        self.reports_generated = [path for path in report_files if path]
 
         logger.info(f"Generated {len(self.reports_generated)} reports for run {run_id}")
         return self.reports_generated
@@ -80,19 +120,23 @@ class Reporter:
         stats = comparison.get('statistics', {})
         discrepancies = results.get('discrepancies', {}).get('summary', {})
 
+        # One timestamp for the whole report; per-row clock reads just add
+        # syscalls without carrying information
+        ts = datetime.now().isoformat()
+
         # Prepare summary data
         summary_rows = [
             ['Metric', 'Value', 'Timestamp'],
-            ['Run ID', run_id, datetime.now().isoformat()],
-            ['Total Unique Keys', stats.get('total_unique_keys', 0), datetime.now().isoformat()],
-            ['Keys in System A', stats.get('keys_in_a', 0), datetime.now().isoformat()],
-            ['Keys Only in A (Propagation Gaps)', stats.get('keys_only_in_a', 0), datetime.now().isoformat()],
-            ['Keys Missing in A (Out of Authority)', stats.get('keys_missing_in_a', 0), datetime.now().isoformat()],
-            ['Keys in All Systems', stats.get('keys_in_all_systems', 0), datetime.now().isoformat()],
-            ['Overall Match Rate', f"{stats.get('match_percentage', 0):.1f}%", datetime.now().isoformat()],
-            ['Total Out of Authority Keys', discrepancies.get('total_out_of_authority', 0), datetime.now().isoformat()],
-            ['Total Propagation Gaps', discrepancies.get('total_propagation_gaps', 0), datetime.now().isoformat()],
-            ['Total Duplicate Groups', discrepancies.get('total_duplicate_groups', 0), datetime.now().isoformat()],
+            ['Run ID', run_id, ts],
+            ['Total Unique Keys', stats.get('total_unique_keys', 0), ts],
+            ['Keys in System A', stats.get('keys_in_a', 0), ts],
+            ['Keys Only in A (Propagation Gaps)', stats.get('keys_only_in_a', 0), ts],
+            ['Keys Missing in A (Out of Authority)', stats.get('keys_missing_in_a', 0), ts],
+            ['Keys in All Systems', stats.get('keys_in_all_systems', 0), ts],
+            ['Overall Match Rate', f"{stats.get('match_percentage', 0):.1f}%", ts],
+            ['Total Out of Authority Keys', discrepancies.get('total_out_of_authority', 0), ts],
+            ['Total Propagation Gaps', discrepancies.get('total_propagation_gaps', 0), ts],
+            ['Total Duplicate Groups', discrepancies.get('total_duplicate_groups', 0), ts],
         ]
 
         # Add system-specific counts
@@ -101,7 +145,7 @@ class Reporter:
             summary_rows.append([
                 f'Keys in System {system}',
                 count,
-                datetime.now().isoformat()
+                ts
             ])
 
         # Write CSV
@@ -115,100 +159,232 @@ class Reporter:
     def generate_missing_in_a_report(
         self,
         run_id: int,
-        discrepancies: Dict[str, Any]
-    ) -> str:
-        """Generate report of keys missing in A that need master key provisioning."""
+        discrepancies: Dict[str, Any],
+        master_key_map: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Optional[str]:
+        """Generate report of keys missing in A that need master key provisioning.
+
+        generate_all_reports passes in the source-key map built from its
+        shared registry fetch; standalone callers leave it None and the
+        map is queried here. Returns None when there is nothing to report.
+        """
         file_path = self.output_dir / 'diff_missing_in_A.csv'
 
         out_of_authority = discrepancies.get('out_of_authority_keys', {})
-
-        rows = []
-        rows.append([
-            'Normalized Key',
-            'Source System',
-            'Original Key',
-            'Proposed Master Key',
-            'Provisioning Strategy',
-            'Status',
-            'Timestamp'
-        ])
-
-        # Get proposed master keys from database
-        master_keys = self.db.get_master_keys()
-        master_key_map = {
-            mk['source_key']: mk
-            for mk in master_keys
-            if mk.get('run_id') == run_id
-        }
-
-        for normalized_key, source_systems in out_of_authority.items():
-            for system_name, original_key in source_systems:
-                master_info = master_key_map.get(original_key, {})
-
-                rows.append([
-                    normalized_key,
-                    system_name,
-                    original_key,
-                    master_info.get('master_key', f'PROPOSED-{normalized_key}'),
-                    master_info.get('provisioning_strategy', 'mirror'),
-                    master_info.get('status', 'pending'),
-                    datetime.now().isoformat()
-                ])
-
-        # Write CSV
-        with open(file_path, 'w', newline='') as f:
+        if not out_of_authority:
+            # Nothing to report; drop any stale file from an earlier run
+            file_path.unlink(missing_ok=True)
+            return None
+
+        if master_key_map is None:
+            # Get this run's master keys; the run_id filter runs in SQLite
+            master_key_map = {
+                mk['source_key']: mk
+                for mk in self.db.get_master_keys(run_id=run_id)
+            }
+
+        ts = datetime.now().isoformat()
+
+        if self.output_format == 'parquet':
+            return self._write_missing_in_a_parquet(out_of_authority,
+                                                    master_key_map, ts)
+
+        # Stream rows as they are produced instead of materializing the list
+        key_count = 0
+        with open(file_path, 'w', newline='', buffering=1 << 20) as f:
             writer = csv.writer(f)
-            writer.writerows(rows)
+            writer.writerow([
+                'Normalized Key',
+                'Source System',
+                'Original Key',
+                'Proposed Master Key',
+                'Provisioning Strategy',
+                'Status',
+                'Timestamp'
+            ])
 
-        logger.info(f"Generated missing in A report: {file_path} ({len(rows)-1} keys)")
+            for normalized_key, source_systems in out_of_authority.items():
+                for system_name, original_key in source_systems:
+                    master_info = master_key_map.get(original_key, {})
+
+                    writer.writerow([
+                        normalized_key,
+                        system_name,
+                        original_key,
+                        master_info.get('master_key', f'PROPOSED-{normalized_key}'),
+                        master_info.get('provisioning_strategy', 'mirror'),
+                        master_info.get('status', 'pending'),
+                        ts
+                    ])
+                    key_count += 1
+
+        logger.info(f"Generated missing in A report: {file_path} ({key_count} keys)")
         return str(file_path)
 
     def generate_missing_from_systems_report(
         self,
         run_id: int,
         discrepancies: Dict[str, Any]
-    ) -> str:
-        """Generate report of keys missing from specific systems (propagation gaps)."""
+    ) -> Optional[str]:
+        """Generate report of keys missing from specific systems (propagation gaps).
+
+        Returns None when there are no gaps to report.
+        """
         file_path = self.output_dir / 'diff_missing_from_system.csv'
 
         propagation_gaps = discrepancies.get('propagation_gaps', {})
+        if not propagation_gaps:
+            # Nothing to report; drop any stale file from an earlier run
+            file_path.unlink(missing_ok=True)
+            return None
 
-        rows = []
-        rows.append([
-            'System',
-            'Normalized Key',
-            'Present in System A',
-            'Action Required',
-            'Timestamp'
-        ])
+        ts = datetime.now().isoformat()
 
-        for system_name, missing_keys in propagation_gaps.items():
-            for key in missing_keys:
-                rows.append([
-                    system_name,
-                    key,
-                    'Yes',
-                    'Propagate from A',
-                    datetime.now().isoformat()
-                ])
+        if self.output_format == 'parquet':
+            return self._write_missing_from_systems_parquet(propagation_gaps, ts)
 
-        # Write CSV
-        with open(file_path, 'w', newline='') as f:
+        # Stream one row per gap straight into the file
+        gap_count = 0
+        with open(file_path, 'w', newline='', buffering=1 << 20) as f:
             writer = csv.writer(f)
-            writer.writerows(rows)
+            writer.writerow([
+                'System',
+                'Normalized Key',
+                'Present in System A',
+                'Action Required',
+                'Timestamp'
+            ])
 
-        logger.info(f"Generated missing from systems report: {file_path} ({len(rows)-1} gaps)")
+            # Only the key varies per row and normalized keys are almost
+            # always plain; when no key needs quoting, format lines directly
+            # and skip csv.writer's per-row dialect handling
+            plain = not any(
+                ',' in key or '"' in key or '\n' in key or '\r' in key
+                for keys in propagation_gaps.values() for key in keys
+            )
+            if plain:
+                buf = []
+                for system_name, missing_keys in propagation_gaps.items():
+                    tail = f',Yes,Propagate from A,{ts}\r\n'
+                    for key in missing_keys:
+                        buf.append(f'{system_name},{key}{tail}')
+                        if len(buf) >= 4096:
+                            f.write(''.join(buf))
+                            buf.clear()
+                    gap_count += len(missing_keys)
+                if buf:
+                    f.write(''.join(buf))
+            else:
+                for system_name, missing_keys in propagation_gaps.items():
+                    for key in missing_keys:
+                        writer.writerow([
+                            system_name,
+                            key,
+                            'Yes',
+                            'Propagate from A',
+                            ts
+                        ])
+                        gap_count += 1
+
+        logger.info(f"Generated missing from systems report: {file_path} ({gap_count} gaps)")
         return str(file_path)
 
-    def generate_master_key_registry(self, run_id: int) -> str:
-        """Generate master key registry CSV."""
-        file_path = self.output_dir / 'master_key_registry.csv'
+    def _write_missing_in_a_parquet(
+        self,
+        out_of_authority: Dict[str, Any],
+        master_key_map: Dict[str, Dict[str, Any]],
+        ts: str
+    ) -> str:
+        """Write the missing-in-A report as a compressed Parquet file."""
+        file_path = self.output_dir / 'diff_missing_in_A.parquet'
 
-        # Get all master keys
-        master_keys = self.db.get_master_keys()
+        normalized_keys, system_names, original_keys = [], [], []
+        proposed_keys, strategies, statuses = [], [], []
+        for normalized_key, source_systems in out_of_authority.items():
+            for system_name, original_key in source_systems:
+                master_info = master_key_map.get(original_key, {})
+                normalized_keys.append(normalized_key)
+                system_names.append(system_name)
+                original_keys.append(original_key)
+                proposed_keys.append(
+                    master_info.get('master_key', f'PROPOSED-{normalized_key}'))
+                strategies.append(
+                    master_info.get('provisioning_strategy', 'mirror'))
+                statuses.append(master_info.get('status', 'pending'))
+
+        table = pa.table({
+            'normalized_key': normalized_keys,
+            'source_system': system_names,
+            'original_key': original_keys,
+            'proposed_master_key': proposed_keys,
+            'provisioning_strategy': strategies,
+            'status': statuses,
+            'timestamp': [ts] * len(normalized_keys),
+        })
+        pq.write_table(table, file_path, compression='zstd')
+
+        logger.info(f"Generated missing in A report: {file_path} "
+                    f"({len(normalized_keys)} keys)")
+        return str(file_path)
+
+    def _write_missing_from_systems_parquet(
+        self,
+        propagation_gaps: Dict[str, List[str]],
+        ts: str
+    ) -> str:
+        """Write the propagation-gaps report as a compressed Parquet file.
+
+        The repeated system names dictionary-encode well, so this file is
+        typically a fraction of the CSV size.
+        """
+        file_path = self.output_dir / 'diff_missing_from_system.parquet'
+
+        system_names, normalized_keys = [], []
+        for system_name, missing_keys in propagation_gaps.items():
+            system_names.extend([system_name] * len(missing_keys))
+            normalized_keys.extend(missing_keys)
+
+        row_count = len(normalized_keys)
+        table = pa.table({
+            'system': system_names,
+            'normalized_key': normalized_keys,
+            'present_in_system_a': ['Yes'] * row_count,
+            'action_required': ['Propagate from A'] * row_count,
+            'timestamp': [ts] * row_count,
+        })
+        pq.write_table(table, file_path, compression='zstd')
+
+        logger.info(f"Generated missing from systems report: {file_path} "
+                    f"({row_count} gaps)")
+        return str(file_path)
 
-        rows = []
-        rows.append([
+    def generate_master_key_registry(
+        self,
+        run_id: int,
+        master_keys: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[str]:
+        """Generate master key registry CSV.
+
+        When generate_all_reports has already fetched the registry, the
+        rows are reused; otherwise they are streamed from the database.
+        Returns None when the registry is empty.
+        """
+        file_path = self.output_dir / 'master_key_registry.csv'
+
+        if master_keys is not None:
+            if not master_keys:
+                file_path.unlink(missing_ok=True)
+                return None
+        else:
+            with self.db.read() as conn:
+                empty = conn.execute(
+                    "SELECT NOT EXISTS(SELECT 1 FROM master_key_registry)"
+                ).fetchone()[0]
+            if empty:
+                file_path.unlink(missing_ok=True)
+                return None
+
+        header = [
             'Master Key ID',
             'Master Key',
             'Source System',
@@ -218,70 +394,82 @@ class Reporter:
             'Created At',
             'Activated At',
             'Run ID'
-        ])
-
-        for mk in master_keys:
-            rows.append([
-                mk['master_key_id'],
-                mk['master_key'],
-                mk['source_system'],
-                mk['source_key'],
-                mk['status'],
-                mk['provisioning_strategy'],
-                mk['created_at'],
-                mk.get('activated_at', ''),
-                mk.get('run_id', '')
-            ])
+        ]
 
-        # Write CSV
-        with open(file_path, 'w', newline='') as f:
+        # Stream the registry straight into the CSV instead of materializing
+        # every row first; a pooled read connection keeps this thread-safe
+        key_count = 0
+        with self.db.read() as conn, open(file_path, 'w', newline='') as f:
             writer = csv.writer(f)
-            writer.writerows(rows)
+            writer.writerow(header)
+            if master_keys is None:
+                master_keys = conn.execute("""
+                    SELECT * FROM master_key_registry
+                    ORDER BY created_at DESC
+                """)
+            for mk in master_keys:
+                writer.writerow([
+                    mk['master_key_id'],
+                    mk['master_key'],
+                    mk['source_system'],
+                    mk['source_key'],
+                    mk['status'],
+                    mk['provisioning_strategy'],
+                    mk['created_at'],
+                    mk['activated_at'] or '',
+                    mk['run_id'] or ''
+                ])
+                key_count += 1
 
-        logger.info(f"Generated master key registry: {file_path} ({len(rows)-1} keys)")
+        logger.info(f"Generated master key registry: {file_path} ({key_count} keys)")
         return str(file_path)
 
     def generate_audit_log(self, run_id: int) -> str:
         """Generate audit log CSV for the run."""
         file_path = self.output_dir / 'audit_log.csv'
 
-        # Query audit log from database
-        cursor = self.db.conn.execute("""
-            SELECT * FROM audit_log
-            WHERE run_id = ?
-            ORDER BY timestamp DESC
-        """, (run_id,))
-
-        rows = []
-        rows.append([
-            'Audit ID',
-            'Timestamp',
-            'Event Type',
-            'Event Details',
-            'System',
-            'Key',
-            'Action Taken',
-            'Result'
-        ])
-
-        for row in cursor:
-            rows.append([
-                row['audit_id'],
-                row['timestamp'],
-                row['event_type'],
-                row['event_details'],
-                row['system_name'] or '',
-                row['key_value'] or '',
-                row['action_taken'] or '',
-                row['result'] or ''
+        # The cursor already streams; write each event as it is fetched
+        event_count = 0
+        with self.db.read() as conn, \
+                open(file_path, 'w', newline='', buffering=1 << 20) as f:
+            # Query audit log from database. Plain tuples are cheaper to
+            # consume than sqlite3.Row's name->index lookup per field, so
+            # select the columns positionally and drop the row factory.
+            cursor = conn.execute("""
+                SELECT audit_id, timestamp, event_type, event_details,
+                       system_name, key_value, action_taken, result
+                FROM audit_log
+                WHERE run_id = ?
+                ORDER BY timestamp DESC
+            """, (run_id,))
+            cursor.row_factory = None
+            writer = csv.writer(f)
+            writer.writerow([
+                'Audit ID',
+                'Timestamp',
+                'Event Type',
+                'Event Details',
+                'System',
+                'Key',
+                'Action Taken',
+                'Result'
             ])
 
-        # Write CSV
-        with open(file_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
+            for (audit_id, timestamp, event_type, event_details,
+                 system_name, key_value, action_taken, result) in cursor:
+                writer.writerow([
+                    audit_id,
+                    timestamp,
+                    event_type,
+                    event_details,
+                    system_name or '',
+                    key_value or '',
+                    action_taken or '',
+                    result or ''
+                ])
+                event_count += 1
 
-        logger.info(f"Generated audit log: {file_path} ({len(rows)-1} events)")
+        logger.info(f"Generated audit log: {file_path} ({event_count} events)")
         return str(file_path)
 
     def generate_trend_analysis(self, run_id: int) -> Optional[str]:
@@ -289,14 +477,24 @@ class Reporter:
         try:
             file_path = self.output_dir / 'trend_analysis.csv'
 
-            # Query historical runs
-            cursor = self.db.conn.execute("""
-                SELECT run_id, run_timestamp, stats_json
-                FROM reconciliation_runs
-                WHERE status = 'completed'
-                ORDER BY run_timestamp DESC
-                LIMIT 30
-            """)
+            # Query historical runs; json_extract pulls just the metrics we
+            # need in SQL instead of decoding each stats blob in Python
+            with self.db.read() as conn:
+                history = conn.execute("""
+                    SELECT run_id, run_timestamp,
+                           COALESCE(json_extract(stats_json, '$.match_percentage'), 0)
+                               AS match_percentage,
+                           COALESCE(json_extract(stats_json, '$.total_unique_keys'), 0)
+                               AS total_unique_keys,
+                           COALESCE(json_extract(stats_json, '$.keys_missing_in_a'), 0)
+                               AS keys_missing_in_a,
+                           COALESCE(json_extract(stats_json, '$.keys_only_in_a'), 0)
+                               AS keys_only_in_a
+                    FROM reconciliation_runs
+                    WHERE status = 'completed'
+                    ORDER BY run_timestamp DESC
+                    LIMIT 30
+                """).fetchall()
 
             rows = []
             rows.append([
@@ -310,10 +508,8 @@ class Reporter:
             ])
 
             prev_match_rate = None
-            for row in cursor:
-                stats = json.loads(row['stats_json'] or '{}')
-
-                match_rate = stats.get('match_percentage', 0)
+            for row in history:
+                match_rate = row['match_percentage']
                 trend = ''
                 if prev_match_rate is not None:
                     if match_rate > prev_match_rate:
@@ -326,10 +522,10 @@ class Reporter:
                 rows.append([
                     row['run_id'],
                     row['run_timestamp'],
-                    stats.get('total_unique_keys', 0),
+                    row['total_unique_keys'],
                     f"{match_rate:.1f}%",
-                    stats.get('keys_missing_in_a', 0),
-                    stats.get('keys_only_in_a', 0),
+                    row['keys_missing_in_a'],
+                    row['keys_only_in_a'],
                     trend
                 ])
 
@@ -3,12 +3,10 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple
 
 import click
 
-from config import Config
-from logger import setup_logging, get_logger
 from sandbox_state import (
     SandboxValidationError,
     build_manager_from_config,
@@ -16,49 +14,82 @@ from sandbox_state import (
     ensure_keys,
     load_keys_from_file,
 )
-from keysync import run_reconciliation
 
-logger = get_logger(__name__)
+if TYPE_CHECKING:
+    from config import Config
 
+# Resolved lazily in _run_reconciliation_with_config so that sandbox commands
+# which never reconcile (status, add-key, save-state, ...) skip importing the
+# full reconciliation stack (database, comparator, reporter, pandas/numpy).
+run_reconciliation = None
 
-def _load_config(config_path: str, verbose: bool) -> Config:
-    """Load configuration and initialize logging."""
-    cfg = Config(config_file=config_path)
+
+def _load_config(ctx: click.Context) -> Config:
+    """Load configuration once per invocation and initialize logging.
+
+    The parsed ``Config`` is cached on ``ctx.obj`` so subcommands that
+    touch it several times (manager build, status report, reconcile hand-off)
+    don't re-read and re-parse the same YAML file.
+    """
+    cached = ctx.obj.get('cfg')
+    if cached is not None:
+        return cached
+    # Deferred so `--help` never pays for the YAML parser or logging setup
+    from config import Config
+    from logger import setup_logging
+
+    cfg = Config(config_file=ctx.obj['config_path'])
     log_level = cfg.get('logging.level', 'INFO')
     log_file = cfg.get('logging.file')
-    if verbose:
+    if ctx.obj['verbose']:
         log_level = 'DEBUG'
-    setup_logging(log_level=log_level, log_file=log_file)
+    if not ctx.obj.get('_logging_ready'):
+        setup_logging(log_level=log_level, log_file=log_file)
+        ctx.obj['_logging_ready'] = True
+    ctx.obj['cfg'] = cfg
     return cfg
 
 
 def _resolve_keys(key_values: Tuple[str, ...], key_file: Path | None) -> List[str]:
     """Collect keys from CLI options and optional file inputs."""
-    keys: List[str] = []
+    # Insertion-ordered dedupe first, then validate the combined set once
+    # instead of running ensure_keys over each source and again over the merge.
+    seen: Dict[str, None] = {}
     if key_file:
-        keys.extend(load_keys_from_file(key_file))
+        seen.update(dict.fromkeys(load_keys_from_file(key_file)))
     if key_values:
-        keys.extend(ensure_keys(key_values))
-    if not keys:
+        seen.update(dict.fromkeys(key_values))
+    if not seen:
         raise SandboxValidationError("At least one key must be supplied")
-    return ensure_keys(keys)
+    return ensure_keys(seen)
 
 
 def _display_report(report: Dict[str, Any]) -> None:
     """Render sandbox summary information to stdout."""
-    click.echo("Sandbox summary:")
+    # Assemble the whole summary and emit it with a single echo: one stdio
+    # lock acquisition and one write instead of one per system
+    lines = ["Sandbox summary:"]
     for system, stats in report['systems'].items():
-        missing = len(report['discrepancies'].get(system, []))
-        click.echo(
+        missing = len(report['discrepancies'].get(system, ()))
+        lines.append(
             f"  {system}: total={stats['total']} unique={stats['unique']} missing={missing}"
         )
-    click.echo(
-        f"\nTotal unique keys: {report['total_unique_keys']}"
-    )
-    click.echo(
-        f"Keys common to all systems: {report['keys_common_to_all']}"
-    )
-    click.echo(f"Snapshots available: {report['snapshot_count']}")
+    lines.append(f"\nTotal unique keys: {report['total_unique_keys']}")
+    lines.append(f"Keys common to all systems: {report['keys_common_to_all']}")
+    lines.append(f"Snapshots available: {report['snapshot_count']}")
+    click.echo("\n".join(lines))
+
+
+def _maybe_display_report(manager, quiet: bool, reconcile: bool) -> None:
+    """Show the status report unless suppressed or a reconcile follows.
+
+    Building the report is a full pass over every system's records;
+    skipping it avoids duplicate work when --quiet is set or when an
+    immediate reconciliation will produce its own summary anyway.
+    """
+    if quiet or reconcile:
+        return
+    _display_report(manager.build_status_report())
 
 
 @click.group()
@@ -80,9 +111,13 @@ def cli(ctx: click.Context, config_path: str, verbose: bool) -> None:
 
 
 def _get_manager(ctx: click.Context):
-    cfg = _load_config(ctx.obj['config_path'], ctx.obj['verbose'])
+    if 'manager' in ctx.obj:
+        return ctx.obj['cfg'], ctx.obj['manager'], ctx.obj['sandbox_defaults']
+    cfg = _load_config(ctx)
     manager = build_manager_from_config(cfg)
     sandbox_defaults = cfg.get_section('sandbox')
+    ctx.obj['manager'] = manager
+    ctx.obj['sandbox_defaults'] = sandbox_defaults
     return cfg, manager, sandbox_defaults
 
 
@@ -112,6 +147,9 @@ def _run_reconciliation_with_config(
         params['keys'] = keys
     if seed is not None:
         params['seed'] = seed
+    global run_reconciliation
+    if run_reconciliation is None:
+        from keysync import run_reconciliation
     try:
         result = run_reconciliation(**params)
     except Exception as exc:
@@ -145,8 +183,9 @@ def _maybe_run_reconciliation(cfg: Config, run_flag: bool) -> None:
     default=False,
     help='Run reconciliation immediately after initialization.',
 )
+@click.option('-q', '--quiet', is_flag=True, help='Suppress the status report after the change.')
 @click.pass_context
-def initialize(ctx: click.Context, keys: int | None, reconcile: bool) -> None:
+def initialize(ctx: click.Context, keys: int | None, reconcile: bool, quiet: bool) -> None:
     """Create a synchronized baseline across all systems."""
     cfg, manager, sandbox_defaults = _get_manager(ctx)
     default_count = sandbox_defaults.get('default_key_count', 1000)
@@ -154,7 +193,7 @@ def initialize(ctx: click.Context, keys: int | None, reconcile: bool) -> None:
     try:
         manager.initialize(key_count)
         click.echo(f"✓ Initialized {key_count} synchronized keys across systems")
-        _display_report(manager.build_status_report())
+        _maybe_display_report(manager, quiet, reconcile)
         _maybe_run_reconciliation(cfg, reconcile)
     except SandboxValidationError as exc:
         raise click.ClickException(str(exc)) from exc
@@ -186,20 +225,21 @@ def status(ctx: click.Context) -> None:
     default=False,
     help='Run reconciliation immediately after adding keys.',
 )
+@click.option('-q', '--quiet', is_flag=True, help='Suppress the status report after the change.')
 @click.pass_context
-def add_key(ctx: click.Context, keys: Tuple[str, ...], key_file: Path | None, systems: Tuple[str, ...], reconcile: bool):
+def add_key(ctx: click.Context, keys: Tuple[str, ...], key_file: Path | None, systems: Tuple[str, ...], reconcile: bool, quiet: bool):
     """Add keys to specified systems."""
     cfg, manager, _ = _get_manager(ctx)
     try:
         key_values = _resolve_keys(keys, key_file)
-        target_systems = systems or tuple(manager.allowed_systems)
-        target_systems = ensure_systems(target_systems, manager.allowed_systems)
+        target_systems = systems or manager.allowed_systems_tuple
+        target_systems = ensure_systems(target_systems, manager.allowed_systems_set)
         added_count, summary = manager.add_keys(key_values, target_systems)
         click.echo(f"✓ Added {added_count} key entries")
         for system, system_keys in summary.items():
             if system_keys:
                 click.echo(f"  {system}: {', '.join(system_keys)}")
-        _display_report(manager.build_status_report())
+        _maybe_display_report(manager, quiet, reconcile)
         _maybe_run_reconciliation(cfg, reconcile)
     except SandboxValidationError as exc:
         raise click.ClickException(str(exc)) from exc
@@ -219,6 +259,7 @@ def add_key(ctx: click.Context, keys: Tuple[str, ...], key_file: Path | None, sy
     default=False,
     help='Run reconciliation after removing keys.',
 )
+@click.option('-q', '--quiet', is_flag=True, help='Suppress the status report after the change.')
 @click.pass_context
 def remove_key(
     ctx: click.Context,
@@ -227,6 +268,7 @@ def remove_key(
     pattern: str | None,
     systems: Tuple[str, ...],
     reconcile: bool,
+    quiet: bool,
 ) -> None:
     """Remove keys from selected systems."""
     if not keys and not key_file and not pattern:
@@ -234,13 +276,13 @@ def remove_key(
     cfg, manager, _ = _get_manager(ctx)
     try:
         key_values = _resolve_keys(keys, key_file) if (keys or key_file) else []
-        target_systems = systems or tuple(manager.allowed_systems)
+        target_systems = systems or manager.allowed_systems_tuple
         summary = manager.remove_keys(key_values, target_systems, pattern)
         click.echo("✓ Removal summary")
         for system, removed in summary.items():
             if removed:
                 click.echo(f"  {system}: {', '.join(removed)}")
-        _display_report(manager.build_status_report())
+        _maybe_display_report(manager, quiet, reconcile)
         _maybe_run_reconciliation(cfg, reconcile)
     except SandboxValidationError as exc:
         raise click.ClickException(str(exc)) from exc
@@ -260,21 +302,24 @@ def remove_key(
     default=False,
     help='Run reconciliation after modifying keys.',
 )
+@click.option('-q', '--quiet', is_flag=True, help='Suppress the status report after the change.')
 @click.pass_context
-def modify_key(ctx: click.Context, rename: Tuple[Tuple[str, str], ...], systems: Tuple[str, ...], reconcile: bool) -> None:
+def modify_key(ctx: click.Context, rename: Tuple[Tuple[str, str], ...], systems: Tuple[str, ...], reconcile: bool, quiet: bool) -> None:
     """Modify keys by renaming them across systems."""
     if not rename:
         raise click.ClickException('Provide at least one --rename OLD NEW pairing')
     cfg, manager, _ = _get_manager(ctx)
     try:
-        replacements = {old: new for old, new in rename}
-        target_systems = systems or tuple(manager.allowed_systems)
+        replacements = dict(rename)
+        if len(replacements) != len(rename):
+            raise click.ClickException('Duplicate OLD key in --rename pairs')
+        target_systems = systems or manager.allowed_systems_tuple
         changes = manager.modify_keys(replacements, target_systems)
         click.echo("✓ Modified keys")
         for system, updates in changes.items():
             for old_key, new_key in updates:
                 click.echo(f"  {system}: {old_key} -> {new_key}")
-        _display_report(manager.build_status_report())
+        _maybe_display_report(manager, quiet, reconcile)
         _maybe_run_reconciliation(cfg, reconcile)
     except SandboxValidationError as exc:
         raise click.ClickException(str(exc)) from exc
@@ -287,20 +332,20 @@ def modify_key(ctx: click.Context, rename: Tuple[Tuple[str, str], ...], systems:
     default=False,
     help='Run reconciliation after resetting the sandbox.',
 )
+@click.option('-q', '--quiet', is_flag=True, help='Suppress the status report after the change.')
 @click.pass_context
-def reset(ctx: click.Context, empty: bool, reconcile: bool) -> None:
+def reset(ctx: click.Context, empty: bool, reconcile: bool, quiet: bool) -> None:
     """Reset sandbox to baseline state."""
     cfg, manager, sandbox_defaults = _get_manager(ctx)
     default_count = sandbox_defaults.get('default_key_count', 1000)
     try:
         if empty:
-            manager.state.records = {system: {} for system in manager.allowed_systems}
-            manager.persist()
+            manager.clear()
             click.echo('✓ Reset sandbox to empty state')
         else:
             manager.initialize(default_count)
             click.echo(f"✓ Reset sandbox with {default_count} synchronized keys")
-        _display_report(manager.build_status_report())
+        _maybe_display_report(manager, quiet, reconcile)
         _maybe_run_reconciliation(cfg, reconcile)
     except SandboxValidationError as exc:
         raise click.ClickException(str(exc)) from exc
@@ -330,7 +375,7 @@ def reconcile_command(
     output_dir: str | None,
 ) -> None:
     """Run the reconciliation engine using current sandbox inputs."""
-    cfg = _load_config(ctx.obj['config_path'], ctx.obj['verbose'])
+    cfg = _load_config(ctx)
     auto_approve = None
     if auto_approve_flag and no_auto_approve_flag:
         raise click.ClickException('Specify only one of --auto-approve or --no-auto-approve')
@@ -375,14 +420,15 @@ def save_state(ctx: click.Context, name: str, note: str | None) -> None:
     default=False,
     help='Run reconciliation after loading the snapshot.',
 )
+@click.option('-q', '--quiet', is_flag=True, help='Suppress the status report after the change.')
 @click.pass_context
-def load_state(ctx: click.Context, snapshot: Path, reconcile: bool) -> None:
+def load_state(ctx: click.Context, snapshot: Path, reconcile: bool, quiet: bool) -> None:
     """Load a previously saved snapshot."""
     cfg, manager, _ = _get_manager(ctx)
     try:
         manager.load_snapshot(snapshot)
         click.echo(f"✓ Loaded snapshot from {snapshot}")
-        _display_report(manager.build_status_report())
+        _maybe_display_report(manager, quiet, reconcile)
         _maybe_run_reconciliation(cfg, reconcile)
     except SandboxValidationError as exc:
         raise click.ClickException(str(exc)) from exc
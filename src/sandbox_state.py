@@ -10,9 +10,12 @@ from __future__ import annotations
 
 import json
 import csv
+import mmap
 import os
+import re
 import time
 import getpass
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -112,9 +115,17 @@ def sanitize_key(raw_key: str) -> str:
     return key
 
 
-def ensure_systems(systems: Iterable[str], allowed: Sequence[str]) -> List[str]:
-    """Validate requested systems and return a sorted unique list."""
-    allowed_upper = {sys.upper() for sys in allowed}
+def ensure_systems(systems: Iterable[str], allowed: Iterable[str]) -> List[str]:
+    """Validate requested systems and return a sorted unique list.
+
+    ``allowed`` may be a pre-uppercased ``frozenset`` (see
+    ``SandboxStateManager.allowed_systems_set``) to skip rebuilding the
+    lookup set on every call.
+    """
+    if isinstance(allowed, frozenset):
+        allowed_upper = allowed
+    else:
+        allowed_upper = {sys.upper() for sys in allowed}
     requested = {sys.strip().upper() for sys in systems if sys and sys.strip()}
     if not requested:
         raise SandboxValidationError("At least one system must be specified")
@@ -144,22 +155,56 @@ def ensure_directory(path: Path) -> None:
 
 
 def load_keys_from_file(file_path: Path) -> List[str]:
-    """Load keys from a text or CSV file."""
+    """Load keys from a text or CSV file.
+
+    The file is memory-mapped and scanned with ``find(b'\\n')`` so large key
+    dumps are traversed by memchr rather than the text-mode line iterator,
+    with keys de-duplicated during the single pass.
+    """
     if not file_path.exists():
         raise SandboxValidationError(f"Key source not found: {file_path}")
-    keys: List[str] = []
-    if file_path.suffix.lower() == '.csv':
-        with file_path.open('r', newline='') as handle:
-            reader = csv.DictReader(handle)
-            if 'key' not in reader.fieldnames:
-                raise SandboxValidationError(
-                    f"CSV file {file_path} must contain a 'key' column"
-                )
-            for row in reader:
-                keys.append(row.get('key', ''))
-    else:
-        with file_path.open('r', encoding='utf-8') as handle:
-            keys.extend(line.strip() for line in handle if line.strip())
+    is_csv = file_path.suffix.lower() == '.csv'
+    keys: Dict[str, None] = {}
+    key_col = 0
+    header_pending = is_csv
+    with file_path.open('rb') as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            mm: Optional[mmap.mmap] = None
+        else:
+            mm = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            pos = 0
+            length = len(mm) if mm is not None else 0
+            while pos < length:
+                nl = mm.find(b'\n', pos)
+                end = length if nl < 0 else nl
+                text = mm[pos:end].rstrip(b'\r').decode('utf-8')
+                pos = end + 1
+                if not text:
+                    continue
+                if header_pending:
+                    fieldnames = next(csv.reader([text]))
+                    if 'key' not in fieldnames:
+                        raise SandboxValidationError(
+                            f"CSV file {file_path} must contain a 'key' column"
+                        )
+                    key_col = fieldnames.index('key')
+                    header_pending = False
+                elif is_csv:
+                    if '"' in text:
+                        row = next(csv.reader([text]))
+                    else:
+                        row = text.split(',')
+                    keys[row[key_col] if key_col < len(row) else ''] = None
+                elif text.strip():
+                    keys[text.strip()] = None
+        finally:
+            if mm is not None:
+                mm.close()
+    if header_pending:
+        raise SandboxValidationError(
+            f"CSV file {file_path} must contain a 'key' column"
+        )
     return ensure_keys(keys)
 
 
@@ -260,12 +305,26 @@ class SandboxStateManager:
         snapshot_dir: Path,
         max_keys: int = 10000,
         default_key_prefix: str = "CUST",
+        parallel_systems: bool = True,
     ):
         self.state = SandboxState(system_files)
         self.snapshot_dir = snapshot_dir
         self.max_keys = max_keys
         self.default_key_prefix = default_key_prefix
+        self.parallel_systems = parallel_systems
         self.allowed_systems = sorted(system_files.keys())
+        self._allowed_systems_tuple = tuple(self.allowed_systems)
+        self._allowed_systems_set = frozenset(sys.upper() for sys in self.allowed_systems)
+
+    @property
+    def allowed_systems_tuple(self) -> Tuple[str, ...]:
+        """Allowed systems as an immutable tuple for reuse without copying."""
+        return self._allowed_systems_tuple
+
+    @property
+    def allowed_systems_set(self) -> frozenset:
+        """Uppercased allowed systems for O(1) validation lookups."""
+        return self._allowed_systems_set
 
     # ------------------------------------------------------------------
     # State lifecycle
@@ -282,6 +341,18 @@ class SandboxStateManager:
     # ------------------------------------------------------------------
     # Core operations
     # ------------------------------------------------------------------
+    def _map_systems(self, fn, systems: Sequence[str]) -> List:
+        """Apply ``fn`` per system, threading across systems when enabled.
+
+        Each call touches only its own system's records dict, so the work
+        is independent across systems; results come back in input order.
+        """
+        if self.parallel_systems and len(systems) > 1:
+            workers = min(len(systems), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(fn, systems))
+        return [fn(system) for system in systems]
+
     def initialize(self, key_count: int) -> None:
         """Initialize synchronized state across all systems."""
         if key_count <= 0:
@@ -300,17 +371,29 @@ class SandboxStateManager:
         self.persist()
         logger.info("Initialized sandbox with %s keys per system", key_count)
 
+    def clear(self) -> None:
+        """Empty every system's records in place and persist the empty state.
+
+        Clearing the existing dicts keeps the outer records mapping (seeded
+        for all systems at construction) intact rather than reallocating it.
+        """
+        for records in self.state.records.values():
+            records.clear()
+        self.persist()
+        logger.info("Cleared sandbox records for all systems")
+
     def add_keys(self, keys: Iterable[str], systems: Iterable[str]) -> Tuple[int, Dict[str, List[str]]]:
         """Add keys to selected systems.
 
         Returns the count of new keys added and a mapping of system -> added keys.
         """
         ensured_keys = ensure_keys(keys)
-        target_systems = ensure_systems(systems, self.allowed_systems)
-        summary: Dict[str, List[str]] = {system: [] for system in target_systems}
+        target_systems = ensure_systems(systems, self._allowed_systems_set)
         timestamp = datetime.utcnow()
-        for system in target_systems:
+
+        def _apply(system: str) -> List[str]:
             records = self.state.records.setdefault(system, {})
+            added: List[str] = []
             for key in ensured_keys:
                 if key not in records:
                     records[key] = SandboxRecord(
@@ -319,7 +402,10 @@ class SandboxStateManager:
                         last_seen_at=timestamp,
                         status="active",
                     )
-                    summary[system].append(key)
+                    added.append(key)
+            return added
+
+        summary = dict(zip(target_systems, self._map_systems(_apply, target_systems)))
         self.persist()
         added_count = sum(len(keys) for keys in summary.values())
         logger.info("Added %s keys across systems %s", added_count, ", ".join(target_systems))
@@ -339,25 +425,29 @@ class SandboxStateManager:
             pattern: Optional substring pattern to match for removal.
         """
         target_systems = ensure_systems(
-            systems or self.allowed_systems,
-            self.allowed_systems,
+            systems or self._allowed_systems_tuple,
+            self._allowed_systems_set,
         )
         keys_to_remove: Set[str] = set(ensure_keys(keys)) if keys else set()
         if pattern:
-            pattern_upper = pattern.upper()
-        summary: Dict[str, List[str]] = {system: [] for system in target_systems}
+            # Compiled once and hoisted out of the per-system loops; the
+            # escaped IGNORECASE search keeps the case-insensitive substring
+            # semantics without a str.upper() copy of every key
+            pattern_match = re.compile(re.escape(pattern), re.IGNORECASE).search
 
-        for system in target_systems:
+        def _apply(system: str) -> List[str]:
             records = self.state.records.get(system, {})
             removal_candidates = set(keys_to_remove)
             if pattern:
-                for key in records.keys():
-                    if pattern_upper in key.upper():
-                        removal_candidates.add(key)
+                removal_candidates.update(filter(pattern_match, records.keys()))
+            removed: List[str] = []
             for key in removal_candidates:
                 if key in records:
                     del records[key]
-                    summary[system].append(key)
+                    removed.append(key)
+            return removed
+
+        summary = dict(zip(target_systems, self._map_systems(_apply, target_systems)))
         self.persist()
         logger.info("Removed keys across systems %s", ", ".join(target_systems))
         return summary
@@ -371,24 +461,30 @@ class SandboxStateManager:
         if not replacements:
             raise SandboxValidationError("No replacements provided")
         target_systems = ensure_systems(
-            systems or self.allowed_systems,
-            self.allowed_systems,
+            systems or self._allowed_systems_tuple,
+            self._allowed_systems_set,
         )
-        changes: Dict[str, List[Tuple[str, str]]] = {system: [] for system in target_systems}
         timestamp = datetime.utcnow()
+        pairs: List[Tuple[str, str]] = []
         for old_raw, new_raw in replacements.items():
             old_key = sanitize_key(old_raw)
             new_key = sanitize_key(new_raw)
-            if old_key == new_key:
-                continue
-            for system in target_systems:
-                records = self.state.records.get(system, {})
+            if old_key != new_key:
+                pairs.append((old_key, new_key))
+
+        def _apply(system: str) -> List[Tuple[str, str]]:
+            records = self.state.records.get(system, {})
+            updates: List[Tuple[str, str]] = []
+            for old_key, new_key in pairs:
                 if old_key in records:
                     record = records.pop(old_key)
                     record.key = new_key
                     record.last_seen_at = timestamp
                     records[new_key] = record
-                    changes[system].append((old_key, new_key))
+                    updates.append((old_key, new_key))
+            return updates
+
+        changes = dict(zip(target_systems, self._map_systems(_apply, target_systems)))
         self.persist()
         return changes
 
@@ -491,11 +587,13 @@ def build_manager_from_config(config: "Config") -> SandboxStateManager:
     )
     max_keys = int(sandbox_cfg.get("max_keys", 10000))
     key_prefix = sandbox_cfg.get("default_key_prefix", "CUST")
+    parallel_systems = bool(sandbox_cfg.get("parallel_systems", True))
     manager = SandboxStateManager(
         system_files=system_files,
         snapshot_dir=snapshot_dir,
         max_keys=max_keys,
         default_key_prefix=key_prefix,
+        parallel_systems=parallel_systems,
     )
     manager.load()
     return manager
@@ -60,18 +60,22 @@ class TestComparator:
 
         return files
 
-    def test_load_system_data(self, comparator, temp_csv_files):
+    def test_load_system_data(self, normalizer, temp_csv_files):
         """Test loading data from CSV file."""
+        comparator = Comparator(normalizer, parallel=False, batch_size=100,
+                                keep_records=True)
         keys, records = comparator.load_system_data(str(temp_csv_files['A']))
         assert len(keys) == 5
         assert 'KEY-001' in keys
-        assert len(records) == 5
+        # Records are columnar: column name -> list of values
+        assert len(records['key']) == 5
+        assert len(records['last_seen_at']) == 5
 
     def test_load_missing_file(self, comparator):
         """Test handling of missing file."""
         keys, records = comparator.load_system_data('/nonexistent/file.csv')
         assert keys == []
-        assert records == []
+        assert records == {}
 
     def test_normalize_system_keys(self, comparator):
         """Test key normalization for a system."""
@@ -126,6 +130,18 @@ class TestComparator:
         # Would need more complex test setup for true parallel testing
         assert comparator.parallel is True
 
+    def test_parallel_processing_merges_normalizer_stats(self, normalizer, temp_csv_files):
+        """Normalization stats from worker processes must reach the parent."""
+        comparator = Comparator(normalizer, parallel=True, batch_size=100)
+        system_files = {name: str(path) for name, path in temp_csv_files.items()}
+
+        results = comparator.compare_all_systems(system_files)
+
+        assert results['statistics']['total_unique_keys'] > 0
+        # 5 keys per system across A/B/C, normalized in the workers
+        assert normalizer.stats['total_normalized'] == 15
+        assert normalizer.stats['transformations_applied']
+
     def test_generate_comparison_summary(self, comparator):
         """Test summary DataFrame generation."""
         results = {
@@ -236,6 +236,44 @@ class TestIntegration:
         discrepancies = result['results']['discrepancies']
         assert discrepancies['out_of_authority_keys']
 
+    def test_incremental_mode_populates_changes(self, temp_workspace, test_config):
+        """--mode incremental must win over the config's default processing mode."""
+        input_dir = Path(temp_workspace) / 'input'
+        generator = MockDataGenerator(seed=42)
+        generator.generate_test_data(
+            scenario='normal',
+            keys_per_system=50,
+            output_dir=str(input_dir)
+        )
+
+        config_path = Path(temp_workspace) / 'incremental-config.yaml'
+        config_lines = [
+            'sources:',
+            *[
+                f"  {system}:\n    type: csv\n    path: {input_dir / f'{system}.csv'}"
+                for system in ['A', 'B', 'C', 'D', 'E']
+            ],
+            'processing:',
+            '  mode: full',  # the default that used to clobber --mode
+            '  parallel: false',
+            'database:',
+            f"  path: {Path(temp_workspace) / 'incremental.db'}",
+        ]
+        config_path.write_text("\n".join(config_lines))
+        output_dir = str(Path(temp_workspace) / 'output')
+
+        first = run_reconciliation(
+            config=str(config_path), mode='full', output_dir=output_dir
+        )
+        assert first['status'] == 'success'
+
+        second = run_reconciliation(
+            config=str(config_path), mode='incremental', output_dir=output_dir
+        )
+        assert second['status'] == 'success'
+        assert second['mode'] == 'incremental'
+        assert second['results']['incremental_changes'] is not None
+
     def test_error_handling(self, temp_workspace, test_config):
         """Test error handling with missing files."""
         # Only create some files
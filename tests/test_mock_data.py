@@ -64,8 +64,8 @@ class TestMockDataGenerator:
         assert 'B' in data
         assert len(data) == 5  # Systems A through E
 
-        # Check that System A exists and has keys
-        assert len(data['A']) > 0
+        # Check that System A exists and has keys (records are columnar)
+        assert len(data['A']['key']) > 0
 
     def test_data_generation_with_duplicates(self, generator):
         """Test duplicate generation."""
@@ -77,7 +77,7 @@ class TestMockDataGenerator:
 
         # Count duplicates in any system
         for system, records in data.items():
-            keys = [r['key'] for r in records]
+            keys = records['key']
             unique_keys = set(keys)
             # Should have some duplicates
             assert len(keys) >= len(unique_keys)
@@ -113,8 +113,8 @@ class TestMockDataGenerator:
         # Should have some corrupted keys
         has_corruption = False
         for system_data in corrupted.values():
-            for record in system_data:
-                if 'CORRUPTED' in record['key']:
+            for key in system_data['key']:
+                if 'CORRUPTED' in key:
                     has_corruption = True
                     break
         assert has_corruption
@@ -0,0 +1,48 @@
+"""Tests for master key provisioning."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import Database
+from provisioner import Provisioner
+
+
+def test_bulk_fallback_handles_mixed_new_and_duplicate_batch():
+    """A duplicate mid-batch must not leave earlier rows half-applied.
+
+    Namespaced master keys don't match the normalized-key dedup check, so a
+    key proposed in an earlier run reaches the bulk insert again and violates
+    the UNIQUE constraint mid-batch. The rows inserted before the failure must
+    be rolled back so the row-by-row retry reports them correctly.
+    """
+    db = Database(db_path=':memory:')
+    try:
+        provisioner = Provisioner(db, config={
+            'strategy': 'namespaced',
+            'namespace_prefix': 'MASTER',
+            'auto_approve': False,
+        })
+
+        run_1 = db.start_run('full', 'normal', {})
+        provisioner.propose_master_keys(run_1, {'K1': [('B', 'k1')]})
+        db.commit()
+
+        run_2 = db.start_run('full', 'normal', {})
+        proposed = provisioner.propose_master_keys(run_2, {
+            'K0': [('B', 'k0')],
+            'K1': [('B', 'k1')],
+            'K2': [('B', 'k2')],
+        })
+        db.commit()
+
+        # The two genuinely new keys succeed and are attributed to run 2;
+        # the duplicate fails cleanly instead of dragging K0 down with it
+        assert sorted(p['normalized_key'] for p in proposed) == ['K0', 'K2']
+        run_2_keys = {mk['master_key'] for mk in db.get_master_keys(run_id=run_2)}
+        assert run_2_keys == {'MASTER-B-K0', 'MASTER-B-K2'}
+        assert provisioner.stats['keys_proposed'] == 3  # one from each run
+    finally:
+        db.close()